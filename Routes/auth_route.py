@@ -22,39 +22,102 @@ Usage:
 1. Initialize the Blueprint in your Flask app.
 2. Ensure the necessary user roles and permissions are enforced for sensitive operations.
 """
-from datetime import datetime, timedelta
+import threading
+from datetime import timedelta
 
-from flask import jsonify, request, Blueprint
-from flask_jwt_extended import create_access_token, jwt_required, get_jwt_identity, create_refresh_token
+from cachetools import TTLCache
+from flask import jsonify, Blueprint, g
+from flask_jwt_extended import create_access_token, jwt_required, get_jwt_identity, create_refresh_token, get_jwt, get_jti
 
 from database import *
-from utils import generate_bcrypt_hash, verify_bcrypt_password, role_required, HttpStatus
-from validators import user
+from utils import generate_bcrypt_hash, verify_bcrypt_password, role_required, HttpStatus, cache, json_response, utc_now
+from validators import user, utils
 
 auth_blueprint = Blueprint('auth', __name__)
 
+# Hash verified when the username does not exist, so unknown and known users cost the same bcrypt work
+_DUMMY_HASH = generate_bcrypt_hash("dummy-password")
+
+# Refresh token lifetime, resolved once since the environment does not change at runtime
+_REFRESH_TTL = timedelta(days=int(os.getenv("JWT_REFRESH_TOKEN_EXPIRES_DAYS")))
+
+# Short lived cache of the refresh tokens (jti -> username) known to be valid; a user may have one per session.
+# Revocations from other workers are only observed after the TTL expires.
+_refresh_token_cache = TTLCache(maxsize=10_000, ttl=15)
+_refresh_token_lock = threading.Lock()
+
+
+def _refresh_token_exists(username, jti):
+    with _refresh_token_lock:
+        if _refresh_token_cache.get(jti) == username:
+            return True
+
+    if not db.jwt_list_repository.exists_by_jti(jti):
+        return False
+
+    with _refresh_token_lock:
+        _refresh_token_cache[jti] = username
+    return True
+
+
+def _forget_refresh_token(username):
+    # only runs when credentials change, scanning the small cache is cheaper than indexing it by username
+    with _refresh_token_lock:
+        for jti in [jti for jti, owner in _refresh_token_cache.items() if owner == username]:
+            _refresh_token_cache.pop(jti, None)
+
+
+# Expired refresh tokens are swept at most once per interval by each worker, piggybacking on logins
+_SWEEP_INTERVAL = timedelta(hours=1)
+_sweep_lock = threading.Lock()
+_next_sweep = None
+
+
+def _sweep_expired_tokens():
+    global _next_sweep
+    now = utc_now()
+    # non-blocking: a login never waits behind another thread's sweep
+    if not _sweep_lock.acquire(blocking=False):
+        return
+    try:
+        if _next_sweep is not None and now < _next_sweep:
+            return
+        _next_sweep = now + _SWEEP_INTERVAL
+        db.jwt_list_repository.delete_expired(now)
+    finally:
+        _sweep_lock.release()
+
+
+# User list served by /auth/get; invalidated by register, edit and delete
+@cache.memoize(timeout=30)
+def _select_users():
+    return db.user_repository.select_all_public_fields()
+
 
 @auth_blueprint.route('/login', methods=['POST'])
-@user.require_username
-@user.require_password
+@utils.validate(user.require_username, user.require_password)
 def login():
-    username = request.json.get('username')
-    password_raw = request.json.get('password')
+    payload = g.body
+    username = payload.get('username')
+    password_raw = payload.get('password')
 
     temp_user = db.user_repository.select_by_username(username)
 
-    if temp_user is not None and temp_user.active:
-        if verify_bcrypt_password(password_raw, temp_user.password_hash):
-            access_token = create_access_token(identity=username)
-            refresh_token = create_refresh_token(identity=username)
+    # always pay the bcrypt cost to avoid a username enumeration timing oracle
+    password_ok = verify_bcrypt_password(password_raw, temp_user.password_hash if temp_user is not None else _DUMMY_HASH)
+    if password_ok & (temp_user is not None and bool(temp_user.active)):
+        access_token = create_access_token(identity=username)
+        refresh_token = create_refresh_token(identity=username)
 
-            expires_at = datetime.now() + timedelta(days=int(os.getenv("JWT_REFRESH_TOKEN_EXPIRES_DAYS")))
-            jwt_item = JWTItem(jti=refresh_token, user_id=temp_user.id, expires_at=expires_at)
+        expires_at = utc_now() + _REFRESH_TTL
+        jwt_item = JWTItem(jti=get_jti(refresh_token), user_id=temp_user.id, expires_at=expires_at)
 
-            db.jwt_list_repository.delete_by_user_id(temp_user.id)
-            db.jwt_list_repository.insert(jwt_item)
+        # each login adds a session, the other sessions of the user keep their refresh tokens until they
+        # expire or the credentials change
+        db.jwt_list_repository.upsert(jwt_item)
+        _sweep_expired_tokens()
 
-            return jsonify(access_token=access_token, refresh_token=refresh_token), 200
+        return jsonify(access_token=access_token, refresh_token=refresh_token), 200
 
     return jsonify(msg='Wrong username or password'), 401
 
@@ -62,43 +125,50 @@ def login():
 @auth_blueprint.route('/refresh', methods=['POST'])
 @jwt_required(refresh=True)
 def refresh():
-    token = request.headers['Authorization'].replace("Bearer ", "")
-    if not db.jwt_list_repository.exists_by_jti(token):
+    # the token is already decoded by jwt_required, whichever location it came from
+    jti = get_jwt()["jti"]
+    current_user = get_jwt_identity()
+    if not _refresh_token_exists(current_user, jti):
         return jsonify(error="Invalid or expired token. Please log in again."), 401
 
-    current_user = get_jwt_identity()
     new_access_token = create_access_token(identity=current_user)
     return jsonify(access_token=new_access_token), 200
 
 
 @auth_blueprint.route('/register', methods=['POST'])
-@user.require_username
-@user.require_name
-@user.require_email
-@user.require_password
-@user.require_active
-@user.require_user_role
+@utils.validate(
+    user.require_username,
+    user.require_name,
+    user.require_email,
+    user.require_password,
+    user.require_active,
+    user.require_user_role,
+)
 @role_required(db, [UserRole.ADMIN])
 def register_user():
-    new_user = User(
-        name=request.json.get('name'),
-        email=request.json.get('email'),
-        username=request.json.get('username'),
-        password_hash=generate_bcrypt_hash(request.json.get('password')),
-        active=request.json.get('active'),
-        role=UserRole(request.json.get('user_role'))
-    )
+    payload = g.body
+    username_taken, email_taken = db.user_repository.check_conflicts(payload.get('username'), payload.get('email'))
 
     # if username exist
-    if db.user_repository.user_name_exists(new_user.username):
+    if username_taken:
         return jsonify(error="Username already exists."), 409
 
     # if email exist
-    if db.user_repository.email_exists(new_user.email):
+    if email_taken:
         return jsonify(error="Email already exists."), 409
 
+    new_user = User(
+        name=payload.get('name'),
+        email=payload.get('email'),
+        username=payload.get('username'),
+        password_hash=generate_bcrypt_hash(payload.get('password')),
+        active=payload.get('active'),
+        role=UserRole(payload.get('user_role'))
+    )
+
     # try insert
     if db.user_repository.insert(new_user):
+        cache.delete_memoized(_select_users)
         return jsonify(success="User registered successfully."), 200
 
     # if insertion fail
@@ -106,47 +176,58 @@ def register_user():
 
 
 @auth_blueprint.route('/edit', methods=['POST'])
-@user.require_username
-@user.optional_new_username
-@user.optional_name
-@user.optional_email
-@user.optional_password
-@user.optional_active
-@user.optional_user_role
+@utils.validate(
+    user.require_username,
+    user.optional_new_username,
+    user.optional_name,
+    user.optional_email,
+    user.optional_password,
+    user.optional_active,
+    user.optional_user_role,
+)
 @role_required(db, [UserRole.ADMIN])
 def edit_user():
-    this_user = db.user_repository.select_by_username(request.json.get('username'))
+    payload = g.body
+    username = payload.get('username')
+    # the caller was already loaded by role_required
+    if username == g.current_user.username:
+        this_user = g.current_user
+    else:
+        this_user = db.user_repository.select_by_username(username)
 
-    password = request.json.get('password', None)
-    password_hash = this_user.password_hash
-    if password is not None:
-        password_hash = generate_bcrypt_hash(password)
+    password = payload.get('password', None)
 
     new_user = User(
         id=this_user.id,
-        name=request.json.get('name', this_user.name),
-        email=request.json.get('email', this_user.email),
-        username=request.json.get('new_username', this_user.username),
-        password_hash=password_hash,
-        active=request.json.get('active', this_user.active),
-        role=UserRole(request.json.get('user_role', this_user.role))
+        name=payload.get('name', this_user.name),
+        email=payload.get('email', this_user.email),
+        username=payload.get('new_username', this_user.username),
+        password_hash=this_user.password_hash,
+        active=payload.get('active', this_user.active),
+        role=UserRole(payload.get('user_role', this_user.role))
     )
 
     # if new_user equals old_user
-    if this_user == new_user:
+    if password is None and this_user == new_user:
         return jsonify(error="Update not have any changes."), HttpStatus.CONFLICT.value
 
     # if email exist
     if this_user.email != new_user.email and db.user_repository.email_exists(new_user.email):
         return jsonify(error="Email already exists."), 409
 
+    # hash only once the cheap checks passed, bcrypt dominates the cost of this request
+    if password is not None:
+        new_user.password_hash = generate_bcrypt_hash(password)
+
     # try insert
     if db.user_repository.update(new_user):
+        cache.delete_memoized(_select_users)
+        # revoke refresh tokens when the credentials change
+        if this_user.username != new_user.username or this_user.password_hash != new_user.password_hash:
+            db.jwt_list_repository.delete_by_user_id(this_user.id)
+            _forget_refresh_token(this_user.username)
         return jsonify(success="User edited successfully."), HttpStatus.OK.value
 
-    if this_user.username != new_user.username or this_user.password_hash != new_user.password_hash:
-        db.jwt_list_repository.delete_by_user_id(this_user.id)
-
     # if insertion fail
     return jsonify(error="User edition failed."), 500
 
@@ -155,13 +236,18 @@ def edit_user():
 @user.require_username
 @role_required(db, [UserRole.ADMIN])
 def delete_user():
-    username = request.json.get('username')
-    temp_user = db.user_repository.select_by_username(username)
+    payload = g.body
+    username = payload.get('username')
+    if username == g.current_user.username:
+        temp_user = g.current_user
+    else:
+        temp_user = db.user_repository.select_by_username(username)
 
     if temp_user is None:
         return jsonify(success="User not found."), HttpStatus.NOT_FOUND.value
 
     if db.user_repository.delete_by_id(temp_user.id):
+        cache.delete_memoized(_select_users)
         return jsonify(success="User delete successfully."), HttpStatus.OK.value
 
     return jsonify(error="User delete error"), HttpStatus.INTERNAL_SERVER_ERROR.value
@@ -170,5 +256,4 @@ def delete_user():
 @auth_blueprint.route('/get', methods=['GET'])
 @role_required(db, [UserRole.ADMIN])
 def get_users():
-    users = [{"name": u.name, "username": u.username, "email": u.email, "role": u.role.value, "active": u.active} for u in db.user_repository.select_all()]
-    return jsonify(success="Success retrieve all users", users=users), HttpStatus.OK.value
+    return json_response(success="Success retrieve all users", users=_select_users())
@@ -19,50 +19,60 @@ Usage:
 1. Initialize the Blueprint in your Flask app.
 2. Ensure that appropriate user roles are enforced for sensitive operations.
 3. Handle pagination for the retrieval of kilogram prices as needed.
+
+Notes:
+- Pages returned by /kg_price/get are memoized for 60 seconds and invalidated on create, update and delete.
 """
-from flask import Blueprint, jsonify, request
+from flask import Blueprint, jsonify, g
 
 from database import *
-from utils import HttpStatus, role_required
+from utils import HttpStatus, role_required, cache, json_response
 from validators import product, utils
 from database import db
 
 kg_price_blueprint = Blueprint('kg_price', __name__)
 
 
+# kg prices change rarely but are read on every order screen; the page is keyed by offset
+@cache.memoize(timeout=60)
+def _select_kg_price_page(limit, offset):
+    return list(db.kg_price_repository.select_all_paged(limit=limit, offset=offset))
+
+
 @kg_price_blueprint.route('/create', methods=['POST'])
-@product.require_price
-@product.required_category
+@utils.validate(product.require_price, product.required_category)
 @role_required(db, [UserRole.ADMIN])
 def create_kg_price():
+    payload = g.body
     new_kg_price = KgPrice(
-        price=request.json.get('price'),
-        category=request.json.get('category'),
+        price=payload.get('price'),
+        category=payload.get('category'),
     )
 
     if db.kg_price_repository.insert(new_kg_price):
+        cache.delete_memoized(_select_kg_price_page)
         return jsonify(success="kg price creation successfully.", new_product=new_kg_price), HttpStatus.CREATED.value
 
     return jsonify(error="kg price creation error"), HttpStatus.INTERNAL_SERVER_ERROR.value
 
 
 @kg_price_blueprint.route('/update', methods=['POST'])
-@product.optional_category
-@product.optional_price
-@product.require_id
+@utils.validate(product.optional_category, product.optional_price, product.require_id)
 @role_required(db, [UserRole.ADMIN])
 def update_kg_price():
-    base_kg_price = db.kg_price_repository.select_by_id(request.json.get("id"))
+    payload = g.body
+    base_kg_price = db.kg_price_repository.select_by_id(payload.get("id"))
     if base_kg_price is None:
         return jsonify(error="kg price not found"), HttpStatus.NOT_FOUND.value
 
     new_kg_price = KgPrice(
         id=base_kg_price.id,
-        price=request.json.get('price', base_kg_price.price),
-        category=request.json.get('category', base_kg_price.category),
+        price=payload.get('price', base_kg_price.price),
+        category=payload.get('category', base_kg_price.category),
     )
 
     if db.kg_price_repository.update(new_kg_price):
+        cache.delete_memoized(_select_kg_price_page)
         return jsonify(success="kg price update successfully.", new_product=new_kg_price), HttpStatus.OK.value
 
     return jsonify(error="kg price update error"), HttpStatus.INTERNAL_SERVER_ERROR.value
@@ -72,10 +82,12 @@ def update_kg_price():
 @product.require_id
 @role_required(db, [UserRole.ADMIN])
 def delete_kg_price():
-    status, rowcount = db.kg_price_repository.delete_by_id(int(request.json.get('id')))
+    payload = g.body
+    status, rowcount = db.kg_price_repository.delete_by_id(int(payload.get('id')))
     if status:
         if rowcount <= 0:
             return jsonify(success="kg price not found."), HttpStatus.NOT_FOUND.value
+        cache.delete_memoized(_select_kg_price_page)
         return jsonify(success="kg price delete successfully."), HttpStatus.OK.value
 
     return jsonify(error="kg price delete error"), HttpStatus.INTERNAL_SERVER_ERROR.value
@@ -85,10 +97,13 @@ def delete_kg_price():
 @utils.optional_offset
 @role_required(db, [UserRole.ADMIN, UserRole.CASHIER, UserRole.WAITER, UserRole.COOK])
 def get_kg_price():
+    payload = g.body
     limit = 100
-    offset = request.json.get('offset', 0)
-    kg_prices = [p for p in db.kg_price_repository.select_all_paged(limit=limit, offset=offset)]
-    if len(kg_prices) == 100:
-        return jsonify(kg_prices=kg_prices, next_page_offset=offset + limit, has_next=True), HttpStatus.OK.value
+    offset = payload.get('offset', 0)
+    kg_prices = _select_kg_price_page(limit + 1, offset)
+    has_next = len(kg_prices) > limit
+    kg_prices = kg_prices[:limit]
+    if has_next:
+        return json_response(kg_prices=kg_prices, next_page_offset=offset + limit, has_next=True)
     else:
-        return jsonify(kg_prices=kg_prices, has_next=False), HttpStatus.OK.value
+        return json_response(kg_prices=kg_prices, has_next=False)
@@ -10,8 +10,8 @@ Endpoints:
 - POST /order/checkout:      Process the checkout for an order (Admin, Cashier, Waiter access required).
 - GET  /order/total:         Retrieve the total amount for an order (Admin, Cashier, Waiter access required).
 - GET  /order/items:         Get the list of items in an order (Admin, Cashier, Waiter, Cook access required).
-- GET  /order/open_orders:   Retrieve a paginated list of open orders (Admin, Cashier, Waiter, Cook access required).
-- GET  /order/closed_orders: Retrieve a paginated list of closed orders (Admin, Cashier, Waiter, Cook access required).
+- GET  /order/open_orders:   Retrieve open orders newest first, paged by cursor (Admin, Cashier, Waiter, Cook access required).
+- GET  /order/closed_orders: Retrieve closed orders newest first, paged by cursor (Admin, Cashier, Waiter, Cook access required).
 
 Dependencies:
 - Flask: For web routing and handling HTTP requests.
@@ -25,168 +25,168 @@ Usage:
 3. Handle pagination for open and closed order retrieval as necessary.
 4. Utilize the provided validators to ensure data integrity for order processing.
 """
-from datetime import datetime
-
-from flask import jsonify, request, Blueprint
+from flask import jsonify, Blueprint, g
 
 from database import *
-from utils import HttpStatus, role_required
+from utils import HttpStatus, role_required, stream_page, static_error, utc_now, cache, STOCK_SUMMARY_KEY
 from validators import order, product, utils
 
 order_blueprint = Blueprint('order', __name__)
 
+# constant error bodies of the hot failure paths, serialized once at import
+ERR_NUMBER_IN_USE = static_error("Order number already exists and is currently open.", HttpStatus.CONFLICT.value)
+ERR_CHECKIN_FAILED = static_error("Failed to create the order.", HttpStatus.INTERNAL_SERVER_ERROR.value)
+ERR_CHECKOUT_FAILED = static_error("Checkout error", HttpStatus.INTERNAL_SERVER_ERROR.value)
+ERR_ORDER_NOT_FOUND = static_error("order number not found", HttpStatus.NOT_FOUND.value)
+ERR_ONE_PRODUCT_KIND = static_error("Either 'product_id' or 'product_per_kg_id' must be provided, but not both.", HttpStatus.CONFLICT.value)
+ERR_PRODUCT_NOT_FOUND = static_error("product not found", HttpStatus.NOT_FOUND.value)
+ERR_PRODUCT_PER_KG_NOT_FOUND = static_error("product per kg not found", HttpStatus.NOT_FOUND.value)
+ERR_ADD_ITEM_FAILED = static_error("Failed to create the order item.", HttpStatus.INTERNAL_SERVER_ERROR.value)
+ERR_TOTAL_FAILED = static_error("error when calc total", HttpStatus.NOT_FOUND.value)
+ERR_ITEMS_FAILED = static_error("error when retrieve order items", HttpStatus.INTERNAL_SERVER_ERROR.value)
+
 
 @order_blueprint.route('/checkin', methods=['POST'])
-@order.require_number
-@order.optional_note
+@utils.validate(order.require_number, order.optional_note)
 @role_required(db, [UserRole.ADMIN, UserRole.CASHIER, UserRole.WAITER])
 def checkin():
+    payload = g.body
     new_order = RestaurantOrder(
-        number=request.json.get('order_number'),
-        entry_time=datetime.now(),
-        note=request.json.get('note', '')
+        number=payload.get('order_number'),
+        entry_time=utc_now(),
+        note=payload.get('note', '')
     )
 
-    # if number exist and order is open
-    if db.restaurant_order_repository.exists_number_open(new_order.number):
-        return jsonify(error="Order number already exists and is currently open."), HttpStatus.CONFLICT.value
+    # try insert, the unique open number index rejects a number that is already open
+    status = db.restaurant_order_repository.insert_with_history(new_order, note="Created")
+    if status is CheckinStatus.CREATED:
+        return jsonify(success="check in successfully."), 200
 
-    # try insert
-    if db.restaurant_order_repository.insert(new_order):
-        order_history = OrderStatusHistory(
-            restaurant_order_id=new_order.id,
-            status=new_order.status,
-            note="Created"
-        )
-        if db.order_status_history_repository.insert(order_history):
-            return jsonify(success="check in successfully."), 200
+    # if number exist and order is open
+    if status is CheckinStatus.NUMBER_IN_USE:
+        return ERR_NUMBER_IN_USE()
 
     # if insertion fail
-    return jsonify(error="Failed to create the order."), 500
+    return ERR_CHECKIN_FAILED()
 
 
 @order_blueprint.route('/checkout', methods=['POST'])
-@order.require_number
-@order.require_payment
-@order.optional_note
+@utils.validate(order.require_number, order.require_payment, order.optional_note)
 @role_required(db, [UserRole.ADMIN, UserRole.CASHIER, UserRole.WAITER])
 def checkout():
-    r_order = db.restaurant_order_repository.select_by_number_open(request.json.get('order_number'))
-    if r_order is None:
-        return jsonify(error="order number not found"), HttpStatus.NOT_FOUND.value
-
-    r_order.payment_method = PaymentMethod(request.json.get('payment_method'))
-    r_order.note = request.json.get('note', r_order.note)
-    r_order.status = OrderStatus.CLOSED
-    r_order.exit_time = datetime.now()
-    r_order.paid = True
+    payload = g.body
+    exit_time = utc_now()
+    # closing the order and recording it in the history share one commit, a failed write rolls back both
+    with db.transaction():
+        result = db.restaurant_order_repository.close_order(
+            payload.get('order_number'),
+            PaymentMethod(payload.get('payment_method')),
+            payload.get('note'),
+            exit_time
+        )
+        if result is None:
+            return ERR_CHECKOUT_FAILED()
 
-    r_order.total_amount = db.restaurant_order_repository.calc_total(r_order.id)
-    if r_order.total_amount is None:
-        return jsonify(error="error when calc total"), HttpStatus.NOT_FOUND.value
+        closed, total, order_id = result
+        if not closed:
+            return ERR_ORDER_NOT_FOUND()
 
-    if db.restaurant_order_repository.update(r_order):
-        return jsonify(success="Checkout successfully"), HttpStatus.OK.value
+        order_history = OrderStatusHistory(
+            restaurant_order_id=order_id,
+            status=OrderStatus.CLOSED,
+            change_time=exit_time,
+            note="Closed"
+        )
+        if not db.order_status_history_repository.insert(order_history):
+            return ERR_CHECKOUT_FAILED()
 
-    return jsonify(error="Checkout error"), HttpStatus.INTERNAL_SERVER_ERROR.value
+    return jsonify(success="Checkout successfully", total=total), HttpStatus.OK.value
 
 
 @order_blueprint.route('/add_item', methods=['POST'])
-@order.require_number
-@product.optional_quantity
-@order.optional_product_id
-@order.optional_product_per_kg_id
+@utils.validate(
+    order.require_number,
+    product.optional_quantity,
+    order.optional_product_id,
+    order.optional_product_per_kg_id,
+)
 @role_required(db, [UserRole.ADMIN, UserRole.CASHIER, UserRole.WAITER])
 def add_item():
-    r_order = db.restaurant_order_repository.select_by_number_open(request.json.get('order_number'))
-    if r_order is None:
-        return jsonify(error="order number not found"), HttpStatus.NOT_FOUND.value
-
-    product_id = request.json.get('product_id')
-    product_per_kg_id = request.json.get('product_per_kg_id')
+    payload_get = g.body.get
+    product_id = payload_get('product_id')
+    product_per_kg_id = payload_get('product_per_kg_id')
 
     if (product_id is not None and product_per_kg_id is not None) or (product_id is None and product_per_kg_id is None):
-        return jsonify(
-            error="Either 'product_id' or 'product_per_kg_id' must be provided, but not both."), HttpStatus.CONFLICT.value
-    elif product_id is not None:
-        order_product = db.product_repository.select_by_id(product_id)
-        if order_product is None:
-            return jsonify(error="product not found"), HttpStatus.NOT_FOUND.value
-        order_item = OrderItem(
-            restaurant_order_id=r_order.id,
-            quantity=request.json.get('quantity', 1),
-            product_id=order_product.id
-        )
-        if db.order_item_repository.insert(order_item):
-            order_product.stock -= order_item.quantity
-            if db.product_repository.update(order_product):
-                return jsonify(success="Product added successfully and product updated", new_item=order_item), HttpStatus.OK.value
-            else:
-                return jsonify(success="Product added successfully", new_item=order_item), HttpStatus.OK.value
-    elif product_per_kg_id is not None:
-        order_product_per_kg = db.product_per_kg_repository.select_by_id(product_per_kg_id)
-        if order_product_per_kg is None:
-            return jsonify(error="product per kg not found"), HttpStatus.NOT_FOUND.value
-        order_item = OrderItem(
-            restaurant_order_id=r_order.id,
-            quantity=request.json.get('quantity', 1),
-            product_per_kg_id=order_product_per_kg.id
-        )
-        if db.order_item_repository.insert(order_item):
-            return jsonify(success="Product per kg added successfully", new_item=order_item), HttpStatus.OK.value
+        return ERR_ONE_PRODUCT_KIND()
 
-    return jsonify(error="Failed to create the order item."), HttpStatus.INTERNAL_SERVER_ERROR.value
+    status, order_item = db.order_item_repository.add_item_atomic(
+        payload_get('order_number'),
+        product_id=product_id,
+        product_per_kg_id=product_per_kg_id,
+        quantity=payload_get('quantity', 1)
+    )
+
+    if status is AddItemStatus.ORDER_NOT_FOUND:
+        return ERR_ORDER_NOT_FOUND()
+    elif status is AddItemStatus.PRODUCT_NOT_FOUND:
+        if product_id is not None:
+            return ERR_PRODUCT_NOT_FOUND()
+        return ERR_PRODUCT_PER_KG_NOT_FOUND()
+    elif status is AddItemStatus.ADDED:
+        if product_id is not None:
+            cache.delete(STOCK_SUMMARY_KEY)
+            return jsonify(success="Product added successfully and product updated", new_item=order_item), HttpStatus.OK.value
+        return jsonify(success="Product per kg added successfully", new_item=order_item), HttpStatus.OK.value
+
+    return ERR_ADD_ITEM_FAILED()
 
 
 @order_blueprint.route('/total', methods=['Get'])
 @order.require_number
 @role_required(db, [UserRole.ADMIN, UserRole.CASHIER, UserRole.WAITER])
 def get_total():
-    r_order = db.restaurant_order_repository.select_by_number_open(request.json.get('order_number'))
+    payload = g.body
+    result = db.restaurant_order_repository.select_open_with_total(payload.get('order_number'))
+    if result is None:
+        return ERR_TOTAL_FAILED()
+
+    r_order, total = result
     if r_order is None:
-        return jsonify(error="order number not found"), HttpStatus.NOT_FOUND.value
+        return ERR_ORDER_NOT_FOUND()
 
-    total = db.restaurant_order_repository.calc_total(r_order.id)
-    if total is not None:
-        return jsonify(success="Success to retrieve order total", total=total), HttpStatus.OK.value
-    return jsonify(error="error when calc total"), HttpStatus.NOT_FOUND.value
+    return jsonify(success="Success to retrieve order total", total=total), HttpStatus.OK.value
 
 
 @order_blueprint.route('/items', methods=['Get'])
 @order.require_number
 @role_required(db, [UserRole.ADMIN, UserRole.CASHIER, UserRole.WAITER, UserRole.COOK])
 def get_order_items():
-    r_order = db.restaurant_order_repository.select_by_number_open(request.json.get('order_number'))
-    if r_order is None:
-        return jsonify(error="order number not found"), HttpStatus.NOT_FOUND.value
+    payload = g.body
+    result = db.order_item_repository.select_items_with_total(payload.get('order_number'))
+    if result is None:
+        return ERR_ITEMS_FAILED()
+
+    order_exists, products, products_per_kg, total = result
+    if not order_exists:
+        return ERR_ORDER_NOT_FOUND()
 
-    products, products_per_kg = db.order_item_repository.select_all_items_special_format(r_order.id)
-    total = db.restaurant_order_repository.calc_total(r_order.id)
     return jsonify(success="All order items", total=total,
                    items={"products": products, "products_per_kg": products_per_kg})
 
 
 @order_blueprint.route('/open_orders', methods=['Get'])
-@utils.optional_offset
+@utils.optional_cursor
 @role_required(db, [UserRole.ADMIN, UserRole.CASHIER, UserRole.WAITER, UserRole.COOK])
 def get_order_open_orders():
     limit = 100
-    offset = request.json.get('offset', 0)
-    products = [p for p in db.restaurant_order_repository.select_all_open_paged(limit=limit, offset=offset)]
-    if len(products) == 100:
-        return jsonify(products=products, next_page_offset=offset + limit, has_next=True), HttpStatus.OK.value
-    else:
-        return jsonify(products=products, has_next=False), HttpStatus.OK.value
+    rows = db.restaurant_order_repository.select_all_open_before(cursor_id=g.body.get('cursor'), limit=limit + 1)
+    return stream_page(rows, "products", limit, cursor_of=lambda row: row.id)
 
 
 @order_blueprint.route('/closed_orders', methods=['Get'])
-@utils.optional_offset
+@utils.optional_cursor
 @role_required(db, [UserRole.ADMIN, UserRole.CASHIER, UserRole.WAITER, UserRole.COOK])
 def get_order_close_orders():
     limit = 100
-    offset = request.json.get('offset', 0)
-    products = [p for p in db.restaurant_order_repository.select_all_close_paged(limit=limit, offset=offset)]
-    if len(products) == 100:
-        return jsonify(products=products, next_page_offset=offset + limit, has_next=True), HttpStatus.OK.value
-    else:
-        return jsonify(products=products, has_next=False), HttpStatus.OK.value
+    rows = db.restaurant_order_repository.select_all_close_before(cursor_id=g.body.get('cursor'), limit=limit + 1)
+    return stream_page(rows, "products", limit, cursor_of=lambda row: row.id)
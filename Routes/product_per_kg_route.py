@@ -7,7 +7,7 @@ Endpoints:
 - POST   /product_per_kg/create: Create a new product priced per kilogram (Admin, Cashier, Waiter, Cook access required).
 - POST   /product_per_kg/update: Update an existing product priced per kilogram (Admin access required).
 - DELETE /product_per_kg/delete: Delete a product priced per kilogram (Admin access required).
-- GET    /product_per_kg/get:    Retrieve a paginated list of products priced per kilogram (Admin, Cashier, Waiter, Cook access required).
+- GET    /product_per_kg/get:    Retrieve products priced per kilogram ordered by ID, paged by cursor (Admin, Cashier, Waiter, Cook access required).
 
 Dependencies:
 - Flask: For routing and handling HTTP requests.
@@ -22,10 +22,10 @@ Usage:
 4. Implement pagination for the product retrieval endpoint to manage large datasets efficiently.
 """
 from flask import Blueprint
-from flask import jsonify, request
+from flask import jsonify, g
 
 from database import *
-from utils import HttpStatus, role_required
+from utils import HttpStatus, role_required, stream_page
 from validators import product, utils
 
 # /product_per_kg/create POST   Admin, Cashier, Waiter, Cook
@@ -37,21 +37,20 @@ product_per_kg_blueprint = Blueprint('product_per_kg', __name__)
 
 
 @product_per_kg_blueprint.route('/create', methods=['POST'])
-@product.require_weight
-@product.require_kg_price_id
-@product.optional_description
+@utils.validate(product.require_weight, product.require_kg_price_id, product.optional_description)
 @role_required(db, [UserRole.ADMIN, UserRole.CASHIER, UserRole.WAITER, UserRole.COOK])
 def create_per_kg_product():
-    kg_price = db.kg_price_repository.select_by_id(request.json.get('kg_price_id'))
+    payload = g.body
+    kg_price = db.kg_price_repository.select_by_id(payload.get('kg_price_id'))
 
     if kg_price is None:
         return jsonify(error="Price per kilogram not found"), HttpStatus.NOT_FOUND.value
 
     new_product = ProductPerKg(
-        weight=request.json.get('weight'),
+        weight=payload.get('weight'),
         price_per_kg=kg_price.price,
         category=kg_price.category,
-        description=request.json.get('description', ''),
+        description=payload.get('description', ''),
     )
 
     if db.product_per_kg_repository.insert(new_product):
@@ -62,18 +61,16 @@ def create_per_kg_product():
 
 
 @product_per_kg_blueprint.route('/update', methods=['POST'])
-@product.require_id
-@product.optional_weight
-@product.optional_kg_price_id
-@product.optional_description
+@utils.validate(product.require_id, product.optional_weight, product.optional_kg_price_id, product.optional_description)
 @role_required(db, [UserRole.ADMIN])
 def update_per_kg_product():
-    base_per_kg_product = db.product_per_kg_repository.select_by_id(request.json.get('id'))
+    payload = g.body
+    base_per_kg_product = db.product_per_kg_repository.select_by_id(payload.get('id'))
 
     if base_per_kg_product is None:
         return jsonify(error="Per kg price not found"), HttpStatus.NOT_FOUND.value
 
-    kg_price_id = request.json.get('kg_price_id')
+    kg_price_id = payload.get('kg_price_id')
     kg_price = None
     if kg_price_id is not None:
         kg_price = db.kg_price_repository.select_by_id(kg_price_id)
@@ -81,11 +78,11 @@ def update_per_kg_product():
             return jsonify(error="kilogram price not found"), HttpStatus.NOT_FOUND.value
 
     new_product = ProductPerKg(
-        id=request.json.get('id'),
-        weight=request.json.get('weight', base_per_kg_product.weight),
+        id=payload.get('id'),
+        weight=payload.get('weight', base_per_kg_product.weight),
         price_per_kg=base_per_kg_product.price_per_kg if kg_price is None else kg_price.price,
         category=base_per_kg_product.category if kg_price is None else kg_price.category,
-        description=request.json.get('description', base_per_kg_product.description),
+        description=payload.get('description', base_per_kg_product.description),
     )
 
     if db.product_per_kg_repository.update(new_product):
@@ -96,24 +93,20 @@ def update_per_kg_product():
 
 
 @product_per_kg_blueprint.route('/get', methods=['GET'])
-@utils.optional_offset
+@utils.optional_cursor
 @role_required(db, [UserRole.ADMIN, UserRole.CASHIER, UserRole.WAITER, UserRole.COOK])
 def get_per_kg_product():
     limit = 100
-    offset = request.json.get('offset', 0)
-    per_kg_products = [p for p in db.product_per_kg_repository.select_all_paged(limit=limit, offset=offset)]
-    if len(per_kg_products) == 100:
-        return jsonify(per_kg_products=per_kg_products, next_page_offset=offset + limit,
-                       has_next=True), HttpStatus.OK.value
-    else:
-        return jsonify(per_kg_products=per_kg_products, has_next=False), HttpStatus.OK.value
+    rows = db.product_per_kg_repository.select_all_after(cursor_id=g.body.get('cursor'), limit=limit + 1)
+    return stream_page(rows, "per_kg_products", limit, cursor_of=lambda row: row.id)
 
 
 @product_per_kg_blueprint.route('/delete', methods=['DELETE'])
 @product.require_id
 @role_required(db, [UserRole.ADMIN])
 def delete_per_kg_product():
-    status, rowcount = db.product_per_kg_repository.delete_by_id(int(request.json.get('id')))
+    payload = g.body
+    status, rowcount = db.product_per_kg_repository.delete_by_id(int(payload.get('id')))
     if status:
         if rowcount <= 0:
             return jsonify(success="per_kg_product not found."), HttpStatus.NOT_FOUND.value
@@ -8,7 +8,7 @@ Endpoints:
 - POST   /product/create: Create a new product (Admin access required).
 - POST   /product/update: Update an existing product (Admin access required).
 - DELETE /product/delete: Delete a product (Admin access required).
-- GET    /product/get:    Retrieve a paginated list of products (Admin, Cashier, Waiter, Cook access required).
+- GET    /product/get:    Retrieve products ordered by ID, paged by cursor (Admin, Cashier, Waiter, Cook access required).
 
 Dependencies:
 - Flask: For routing and handling HTTP requests.
@@ -26,10 +26,10 @@ Notes:
 - Ensure that the database and repository methods used for product management are correctly defined
   in the database module to handle CRUD operations effectively.
 """
-from flask import Blueprint, jsonify, request
+from flask import Blueprint, jsonify, g
 
 from database import *
-from utils import HttpStatus, role_required
+from utils import HttpStatus, role_required, cache, STOCK_SUMMARY_KEY, stream_page
 from validators import product, utils
 from database import db
 
@@ -42,55 +42,63 @@ product_blueprint = Blueprint('product', __name__)
 
 
 @product_blueprint.route('/create', methods=['POST'])
-@product.require_name
-@product.require_price
-@product.require_stock
-@product.optional_category
-@product.optional_description
-@product.optional_active
+@utils.validate(
+    product.require_name,
+    product.require_price,
+    product.require_stock,
+    product.optional_category,
+    product.optional_description,
+    product.optional_active,
+)
 @role_required(db, [UserRole.ADMIN])
 def create_product():
+    payload = g.body
     new_product = Product(
-        name=request.json.get('name'),
-        price=request.json.get('price'),
-        stock=request.json.get('stock'),
-        category=request.json.get('category', ''),
-        description=request.json.get('description', ''),
-        active=request.json.get('active', False)
+        name=payload.get('name'),
+        price=payload.get('price'),
+        stock=payload.get('stock'),
+        category=payload.get('category', ''),
+        description=payload.get('description', ''),
+        active=payload.get('active', False)
     )
 
     if db.product_repository.insert(new_product):
+        cache.delete(STOCK_SUMMARY_KEY)
         return jsonify(success="Product creation successfully.", new_product=new_product), HttpStatus.CREATED.value
 
     return jsonify(error="Product creation error"), HttpStatus.INTERNAL_SERVER_ERROR.value
 
 
 @product_blueprint.route('/update', methods=['POST'])
-@product.require_id
-@product.optional_name
-@product.optional_price
-@product.optional_stock
-@product.optional_category
-@product.optional_description
-@product.optional_active
+@utils.validate(
+    product.require_id,
+    product.optional_name,
+    product.optional_price,
+    product.optional_stock,
+    product.optional_category,
+    product.optional_description,
+    product.optional_active,
+)
 @role_required(db, [UserRole.ADMIN])
 def update_product():
-    base_product = db.product_repository.select_by_id(request.json.get('id'))
+    payload = g.body
+    base_product = db.product_repository.select_by_id(payload.get('id'))
 
     if base_product is None:
         return jsonify(error="Product not found."), HttpStatus.NOT_FOUND.value
 
     updated_product = Product(
         id=base_product.id,
-        name=request.json.get('name', base_product.name),
-        price=request.json.get('price', base_product.price),
-        stock=request.json.get('stock', base_product.stock),
-        category=request.json.get('category', base_product.category),
-        description=request.json.get('description', base_product.description),
-        active=request.json.get('active', base_product.active)
+        name=payload.get('name', base_product.name),
+        price=payload.get('price', base_product.price),
+        stock=payload.get('stock', base_product.stock),
+        category=payload.get('category', base_product.category),
+        description=payload.get('description', base_product.description),
+        active=payload.get('active', base_product.active)
     )
 
     if db.product_repository.update(updated_product):
+        cache.delete(STOCK_SUMMARY_KEY)
         return jsonify(success="Product update successfully.", updated_product=updated_product), HttpStatus.OK.value
 
     return jsonify(error="Product update error"), HttpStatus.INTERNAL_SERVER_ERROR.value
@@ -100,23 +108,21 @@ def update_product():
 @product.require_id
 @role_required(db, [UserRole.ADMIN])
 def delete_product():
-    status, rowcount = db.product_repository.delete_by_id(int(request.json.get('id')))
+    payload = g.body
+    status, rowcount = db.product_repository.delete_by_id(int(payload.get('id')))
     if status:
         if rowcount <= 0:
             return jsonify(error="Product not found."), HttpStatus.NOT_FOUND.value
+        cache.delete(STOCK_SUMMARY_KEY)
         return jsonify(success="Product delete successfully."), HttpStatus.OK.value
 
     return jsonify(error="Product delete error"), HttpStatus.INTERNAL_SERVER_ERROR.value
 
 
 @product_blueprint.route('/get', methods=['GET'])
-@utils.optional_offset
+@utils.optional_cursor
 @role_required(db, [UserRole.ADMIN, UserRole.CASHIER, UserRole.WAITER, UserRole.COOK])
 def get_products():
     limit = 100
-    offset = request.json.get('offset', 0)
-    products = [p for p in db.product_repository.select_all_paged(limit=limit, offset=offset)]
-    if len(products) == 100:
-        return jsonify(products=products, next_page_offset=offset + limit, has_next=True), HttpStatus.OK.value
-    else:
-        return jsonify(products=products, has_next=False), HttpStatus.OK.value
+    rows = db.product_repository.select_all_after(cursor_id=g.body.get('cursor'), limit=limit + 1)
+    return stream_page(rows, "products", limit, cursor_of=lambda row: row.id)
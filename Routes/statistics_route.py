@@ -19,26 +19,35 @@ Dependencies:
 Usage:
 1. Initialize the Blueprint in your Flask app to handle statistics-related routes.
 2. Use the `role_required` decorator to enforce user access restrictions for each endpoint.
-3. Implement the `get_order_status` function to centralize the retrieval of order statistics and payment summaries.
+3. Implement the `get_order_status` function to centralize the retrieval and caching of order statistics and payment summaries.
 4. Ensure the corresponding methods for fetching payment summaries and order statistics are correctly implemented in the database module.
 
 Notes:
-- The date calculations utilize Python's `datetime` module to determine the timeframes for statistics.
+- The timeframes are computed by the database from the number of days (`UTC_TIMESTAMP() - INTERVAL n DAY`); the
+  lifetime statistics have no lower bound.
 - If no data is found for the requested statistics, appropriate error messages are returned with the relevant HTTP status codes.
+- Results are cached: 60 seconds for a day, 5 minutes for a week, 1 hour for a month or a year, 1 day for the
+  lifetime, and 30 seconds for the stock summary, which is also cleared whenever the product stock changes.
 """
-from datetime import datetime, timedelta
-
 from flask import jsonify, Blueprint
 
 from database import *
-from utils import role_required, HttpStatus
+from utils import role_required, HttpStatus, cache, STOCK_SUMMARY_KEY
 
 statistics_blueprint = Blueprint('statistics', __name__)
 
 
-def get_order_status(before, after):
-    payment_summary = db.restaurant_order_repository.get_payment_summary(before, after)
-    order_stats = db.restaurant_order_repository.get_order_stats(before, after)
+def get_order_status(period, days, timeout):
+    # the aggregates scan the whole window, so each window is cached for a time proportional to its length
+    key = f"stats:order:{period}"
+    stats = cache.get(key)
+    if stats is None:
+        stats = (db.restaurant_order_repository.get_payment_summary(days),
+                 db.restaurant_order_repository.get_order_stats(days))
+        if stats != (None, None):
+            cache.set(key, stats, timeout=timeout)
+
+    payment_summary, order_stats = stats
 
     if payment_summary is None and order_stats is None:
         return jsonify(error="No have any stats."), HttpStatus.NOT_FOUND.value
@@ -49,48 +58,41 @@ def get_order_status(before, after):
 @statistics_blueprint.route('/order/day', methods=['Get'])
 @role_required(db, [UserRole.ADMIN, UserRole.CASHIER, UserRole.WAITER, UserRole.COOK])
 def get_order_status_day():
-    now = datetime.now()
-    before_now = now - timedelta(days=1)
-    return get_order_status(before_now, now)
+    return get_order_status('day', 1, timeout=60)
 
 
 @statistics_blueprint.route('/order/week', methods=['Get'])
 @role_required(db, [UserRole.ADMIN, UserRole.CASHIER, UserRole.WAITER, UserRole.COOK])
 def get_order_status_week():
-    now = datetime.now()
-    before_now = now - timedelta(days=7)
-    return get_order_status(before_now, now)
+    return get_order_status('week', 7, timeout=300)
 
 
 @statistics_blueprint.route('/order/month', methods=['Get'])
 @role_required(db, [UserRole.ADMIN, UserRole.CASHIER, UserRole.WAITER, UserRole.COOK])
 def get_order_status_month():
-    now = datetime.now()
-    before_now = now - timedelta(days=30)
-    return get_order_status(before_now, now)
+    return get_order_status('month', 30, timeout=3600)
 
 
 @statistics_blueprint.route('/order/year', methods=['Get'])
 @role_required(db, [UserRole.ADMIN, UserRole.CASHIER, UserRole.WAITER, UserRole.COOK])
 def get_order_status_year():
-    now = datetime.now()
-    before_now = now - timedelta(days=365)
-    return get_order_status(before_now, now)
+    return get_order_status('year', 365, timeout=3600)
 
 
 @statistics_blueprint.route('/order/lifetime', methods=['Get'])
 @role_required(db, [UserRole.ADMIN, UserRole.CASHIER, UserRole.WAITER, UserRole.COOK])
 def get_order_status_lifetime():
-    now = datetime.now()
-    before_now = datetime(1900, 1, 1)
-    return get_order_status(before_now, now)
+    return get_order_status('lifetime', None, timeout=86400)
 
 
 @statistics_blueprint.route('/product/stock', methods=['Get'])
 @role_required(db, [UserRole.ADMIN, UserRole.CASHIER, UserRole.WAITER, UserRole.COOK])
 def get_stock():
-    stock = db.product_repository.get_product_summary()
+    stock = cache.get(STOCK_SUMMARY_KEY)
     if stock is None:
-        return jsonify(error="Error on get product stock."), HttpStatus.INTERNAL_SERVER_ERROR.value
+        stock = db.product_repository.get_product_summary()
+        if stock is None:
+            return jsonify(error="Error on get product stock."), HttpStatus.INTERNAL_SERVER_ERROR.value
+        cache.set(STOCK_SUMMARY_KEY, stock, timeout=30)
 
     return jsonify(success="Success retried stock stats", stock_summary=stock)
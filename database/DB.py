@@ -1,29 +1,218 @@
 """
 Module for managing database connections and operations for a restaurant management system.
 
-This module defines the DB class, which establishes a connection to a MariaDB database and
-creates the necessary tables for managing restaurant orders, products, users, and JSON Web Tokens (JWTs).
+This module defines the DB class, which serves connections from a MariaDB connection pool and can create
+the necessary tables for managing restaurant orders, products, users, and JSON Web Tokens (JWTs).
 """
+import hashlib
+import logging
+import threading
+from contextlib import contextmanager
+from functools import cached_property
+
 import mariadb
+from mariadb.constants import CLIENT
+
+from database.repositorys import (
+    RestaurantOrderRepository, UserRepository, ProductRepository, ProductPerKgRepository,
+    OrderStatusHistoryRepository, OrderItemRepository, JWTListRepository, KgPriceRepository
+)
+
+logger = logging.getLogger(__name__)
+
+# Bounds on how long a worker can be stuck on the database (seconds). The session settings are sent with the
+# handshake through init_command, so they cost no extra round-trip; the pool already pings connections that sat
+# idle before handing them out
+_CONNECT_TIMEOUT = 5
+_IO_TIMEOUT = 30
+_SESSION_INIT = "SET SESSION max_statement_time = 20, wait_timeout = 600"
 
-from database.repositorys import *
+# Prepared cursors kept per pooled connection by DB.prepared_cursor
+_MAX_PREPARED_PER_CONNECTION = 32
+
+# Every table is created with the same engine, row format and character set, independent of server defaults.
+# MySQL's utf8mb4_0900_ai_ci does not exist in MariaDB, utf8mb4_unicode_ci is its closest equivalent
+_TABLE_OPTIONS = "ENGINE=InnoDB ROW_FORMAT=DYNAMIC DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci"
+
+# Schema of the restaurant database, sent as a single multi-statement batch by DB.bootstrap
+_DDL = f"""
+CREATE TABLE IF NOT EXISTS `RestaurantOrder` (
+    ID INT AUTO_INCREMENT PRIMARY KEY,
+    Number INT NOT NULL,
+    Entry_Time DATETIME NOT NULL,
+    Exit_Time DATETIME DEFAULT NULL,
+    Status ENUM('Open', 'Closed', 'Cancelled') DEFAULT 'Open',
+    Note TEXT,
+    Payment_Method ENUM('Cash', 'Card', 'Pix', 'Others') DEFAULT NULL,
+    Total_Amount DECIMAL(10, 2) DEFAULT 0.00,
+    Paid BOOLEAN DEFAULT FALSE
+) {_TABLE_OPTIONS};
+CREATE TABLE IF NOT EXISTS OrderStatusHistory (
+    ID INT AUTO_INCREMENT PRIMARY KEY,
+    RestaurantOrder_ID INT NOT NULL,
+    Status ENUM('Open', 'Closed', 'Cancelled') NOT NULL,
+    Change_Time DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    note TEXT,
+    FOREIGN KEY (RestaurantOrder_ID) REFERENCES `RestaurantOrder`(ID)
+) {_TABLE_OPTIONS};
+CREATE TABLE IF NOT EXISTS Product (
+    ID INT AUTO_INCREMENT PRIMARY KEY,
+    Name VARCHAR(255) NOT NULL,
+    Description TEXT,
+    Price DECIMAL(10, 2) NOT NULL,
+    Category VARCHAR(255),
+    Stock INT NOT NULL,
+    Active BOOLEAN DEFAULT TRUE
+) {_TABLE_OPTIONS};
+CREATE TABLE IF NOT EXISTS ProductPerKg (
+    ID INT AUTO_INCREMENT PRIMARY KEY,
+    Description TEXT,
+    Weight DECIMAL(10, 2) NOT NULL,
+    PricePerKg DECIMAL(10, 2) NOT NULL,
+    Total DECIMAL(10, 2) GENERATED ALWAYS AS (Weight * PricePerKg) STORED,
+    Category VARCHAR(255)
+) {_TABLE_OPTIONS};
+CREATE TABLE IF NOT EXISTS KgPrice (
+    ID INT AUTO_INCREMENT PRIMARY KEY,
+    Price DECIMAL(10, 2) NOT NULL,
+    Category VARCHAR(255) NOT NULL
+) {_TABLE_OPTIONS};
+CREATE TABLE IF NOT EXISTS OrderItem (
+    ID INT AUTO_INCREMENT PRIMARY KEY,
+    RestaurantOrderID INT,
+    ProductID INT,
+    ProductPerKgID INT,
+    Quantity INT DEFAULT 1,
+    FOREIGN KEY (RestaurantOrderID) REFERENCES `RestaurantOrder`(ID),
+    FOREIGN KEY (ProductID) REFERENCES Product(ID),
+    FOREIGN KEY (ProductPerKgID) REFERENCES ProductPerKg(ID),
+    CHECK ((ProductID IS NOT NULL AND ProductPerKgID IS NULL) OR (ProductPerKgID IS NOT NULL AND ProductID IS NULL))
+) {_TABLE_OPTIONS};
+CREATE TABLE IF NOT EXISTS `User` (
+    ID INT AUTO_INCREMENT PRIMARY KEY,
+    Name VARCHAR(255) NOT NULL,
+    Username VARCHAR(255) NOT NULL UNIQUE,
+    Email VARCHAR(255) NOT NULL UNIQUE,
+    PasswordHash VARCHAR(255) NOT NULL,
+    Role ENUM('Admin', 'Waiter', 'Cook', 'Cashier') DEFAULT 'Cashier',
+    Active BOOLEAN DEFAULT TRUE
+) {_TABLE_OPTIONS};
+CREATE TABLE IF NOT EXISTS JWTList (
+    user_id INT NOT NULL,
+    jti CHAR(36) CHARACTER SET ascii NOT NULL UNIQUE,
+    expires_at TIMESTAMP NOT NULL,
+    PRIMARY KEY (user_id, jti),
+    CONSTRAINT fk_user FOREIGN KEY (user_id) REFERENCES User(ID)
+) {_TABLE_OPTIONS};
+CREATE INDEX IF NOT EXISTS idx_username ON User (Username);
+-- the UNIQUE constraint already indexes jti; a second index on it only doubled the writes on every login
+DROP INDEX IF EXISTS idx_jti ON JWTList;
+-- expiry sweep of the refresh tokens
+CREATE INDEX IF NOT EXISTS idx_jwt_expires ON JWTList (expires_at);
+CREATE INDEX IF NOT EXISTS idx_order_status_id ON RestaurantOrder (Status, ID);
+-- open order lookups by number (add_item, total, items, checkout)
+CREATE INDEX IF NOT EXISTS idx_order_number_status ON RestaurantOrder (Number, Status);
+-- statistics: paid orders within an entry time range
+CREATE INDEX IF NOT EXISTS idx_order_paid_entry ON RestaurantOrder (Paid, Entry_Time);
+-- order history in chronological order, also replaces the implicit foreign key index
+CREATE INDEX IF NOT EXISTS idx_history_order_time ON OrderStatusHistory (RestaurantOrder_ID, Change_Time);
+-- MariaDB has no partial indexes: the number is only unique among open orders through a column that is
+-- NULL for every other status, and NULLs never collide in a UNIQUE index
+ALTER TABLE RestaurantOrder ADD COLUMN IF NOT EXISTS
+    Open_Number INT AS (IF(Status = 'Open', Number, NULL)) PERSISTENT;
+CREATE UNIQUE INDEX IF NOT EXISTS uq_open_number ON RestaurantOrder (Open_Number);
+"""
+
+# Triggers keeping RestaurantOrder.Total_Amount in sync with OrderItem and with the product prices. Every change
+# re-sums the order from its items at the current prices, so a total never depends on the price an item had when it
+# was added and cannot drift. A price change re-sums the open orders holding that product; closed orders keep the
+# amount they were charged
+_ORDER_TOTAL = """COALESCE((
+    SELECT SUM(OrderItem.Quantity * COALESCE(Product.Price, ProductPerKg.PricePerKg * ProductPerKg.Weight))
+    FROM OrderItem
+    LEFT JOIN Product ON OrderItem.ProductID = Product.ID
+    LEFT JOIN ProductPerKg ON OrderItem.ProductPerKgID = ProductPerKg.ID
+    WHERE OrderItem.RestaurantOrderID = {order}), 0)"""
+_TOTAL_TRIGGERS_DDL = f"""
+CREATE OR REPLACE TRIGGER trg_order_item_total_insert AFTER INSERT ON OrderItem FOR EACH ROW
+    UPDATE RestaurantOrder SET Total_Amount = {_ORDER_TOTAL.format(order="NEW.RestaurantOrderID")}
+    WHERE ID = NEW.RestaurantOrderID;
+CREATE OR REPLACE TRIGGER trg_order_item_total_delete AFTER DELETE ON OrderItem FOR EACH ROW
+    UPDATE RestaurantOrder SET Total_Amount = {_ORDER_TOTAL.format(order="OLD.RestaurantOrderID")}
+    WHERE ID = OLD.RestaurantOrderID;
+CREATE OR REPLACE TRIGGER trg_order_item_total_update AFTER UPDATE ON OrderItem FOR EACH ROW
+    UPDATE RestaurantOrder SET Total_Amount = {_ORDER_TOTAL.format(order="RestaurantOrder.ID")}
+    WHERE ID IN (OLD.RestaurantOrderID, NEW.RestaurantOrderID);
+-- the stock decrement of every add_item also updates Product, only a price change re-sums anything
+CREATE OR REPLACE TRIGGER trg_product_price_total AFTER UPDATE ON Product FOR EACH ROW
+    IF NEW.Price <> OLD.Price THEN
+        UPDATE RestaurantOrder SET Total_Amount = {_ORDER_TOTAL.format(order="RestaurantOrder.ID")}
+        WHERE Status = 'Open' AND ID IN (SELECT RestaurantOrderID FROM OrderItem WHERE ProductID = NEW.ID);
+    END IF;
+CREATE OR REPLACE TRIGGER trg_product_per_kg_price_total AFTER UPDATE ON ProductPerKg FOR EACH ROW
+    IF NEW.PricePerKg <> OLD.PricePerKg OR NEW.Weight <> OLD.Weight THEN
+        UPDATE RestaurantOrder SET Total_Amount = {_ORDER_TOTAL.format(order="RestaurantOrder.ID")}
+        WHERE Status = 'Open' AND ID IN (SELECT RestaurantOrderID FROM OrderItem WHERE ProductPerKgID = NEW.ID);
+    END IF;
+
+-- open orders summed by older triggers, or opened before the triggers existed, are re-summed once
+UPDATE RestaurantOrder SET Total_Amount = {_ORDER_TOTAL.format(order="RestaurantOrder.ID")}
+WHERE Status = 'Open';"""
+
+# Fingerprint of the schema, stored in SchemaVersion so an unchanged schema is not sent again
+_SCHEMA_HASH = hashlib.blake2b((_DDL + _TOTAL_TRIGGERS_DDL).encode(), digest_size=8).hexdigest()
 
 
 class DB:
     """Database connection and management class for a restaurant management system.
 
-        This class handles the connection to a MariaDB database and the creation of necessary
-        tables for storing data related to restaurant orders, products, users, and JWTs.
+        This class hands out pooled connections to the repositories. Creating the tables for storing data
+        related to restaurant orders, products, users, and JWTs is a separate, one-shot step (`bootstrap`),
+        run by `python -m database.bootstrap` rather than by every process that imports the package.
+
+        Each thread checks a connection out of the pool the first time it touches `conn` and keeps it
+        until `release()` is called, which the Flask app does on `teardown_appcontext`. Established
+        sockets are reused across requests instead of sharing a single connection between all threads.
+        The pool itself is only opened the first time a connection is needed.
+
+        Repositories commit through `commit()`/`rollback()`. Inside `with db.transaction():` the commits are
+        deferred, so several writes cost a single COMMIT (and a single log flush) when the block exits; an
+        exception or a failed write rolls the whole block back, and a failed COMMIT is re-raised after the rollback.
+
+        When a replica is configured (`read_host_ip`), `read_conn` serves read-only queries that tolerate
+        replication lag (listings and statistics) from a second pool against it; otherwise it is `conn`.
+
+        Hot statements can go through `prepared_cursor(sql)`, which keeps one server-side prepared cursor per
+        connection and statement, so the server parses and plans them once per connection instead of per call.
+        The pool does not reset sessions (that would drop the prepared statements); `release()` rolls back
+        instead, so no transaction or read snapshot outlives the request.
 
         Attributes:
-            conn (mariadb.Connection): The connection to the MariaDB database.
+            conn (mariadb.Connection): The pooled connection bound to the current thread.
+            read_conn (mariadb.Connection): The replica connection bound to the current thread, or `conn`.
             db_name (str): The name of the database to be created or used.
+            pool (mariadb.ConnectionPool): The pool the connections are taken from, opened on first use.
+            read_pool (mariadb.ConnectionPool): The pool of replica connections, opened on first use.
 
         Methods:
-            __create_tables(): Creates necessary tables for the restaurant management system
-                               if they do not already exist.
+            transaction(): Context manager grouping the repository writes of the block into one transaction.
+            commit(): Commits the current thread's connection, deferred while inside `transaction()`.
+            rollback(): Rolls back the current thread's connection, failing the enclosing `transaction()`.
+            release(): Rolls back and returns the current thread's connections to their pools.
+            prepared_cursor(sql): Returns the cached prepared cursor of `sql` on the current thread's connection.
+            bootstrap(host_ip, port, user, password, db_name): Creates the database and its tables,
+                                                               indexes and triggers if they do not already exist.
+            __create_tables(conn, db_name): Creates necessary tables for the restaurant management system
+                                            if they do not already exist, skipping the schema when its
+                                            hash matches the one recorded in SchemaVersion.
+            __check_open_numbers(cursor, db_name): Raises a RuntimeError naming the duplicated open order numbers
+                                                   that would keep uq_open_number from being created.
+            __migrate_jwt_list(cursor, db_name): Narrows an old JWTList.jti column to a jti, dropping the stored
+                                                 tokens, and keys the table by (user_id, jti), only when needed.
+            __create_total_triggers(cursor): Creates the OrderItem, Product and ProductPerKg triggers that maintain
+                                             RestaurantOrder.Total_Amount, re-summing the open orders.
 
-        Properties:
+        Properties (created once and cached on the instance):
             restaurant_order_repository: Provides access to the RestaurantOrder repository.
             user_repository: Provides access to the User repository.
             product_repository: Provides access to the Product repository.
@@ -33,124 +222,266 @@ class DB:
             jwt_list_repository: Provides access to the JWTList repository.
             kg_price_repository: Provides access to the KgPrice repository.
     """
-    def __init__(self, host_ip: str, port: int, user: str, password: str, db_name: str):
-        self.conn = mariadb.connect(host=host_ip, port=port, user=user, password=password)
+    def __init__(self, host_ip: str, port: int, user: str, password: str, db_name: str, pool_size: int = 5,
+                 create_tables: bool = False, read_host_ip: str | None = None):
         self.db_name = db_name
-        self.__create_tables()
+        self.__pool_args = dict(pool_name=f"{db_name}_pool", pool_size=pool_size, pool_reset_connection=False,
+                                autocommit=False, host=host_ip, port=port, user=user, password=password,
+                                database=db_name, connect_timeout=_CONNECT_TIMEOUT, read_timeout=_IO_TIMEOUT,
+                                write_timeout=_IO_TIMEOUT, init_command=_SESSION_INIT)
+        # same settings against the replica, None when every query goes to the primary
+        self.__read_pool_args = None
+        if read_host_ip:
+            self.__read_pool_args = dict(self.__pool_args, pool_name=f"{db_name}_read_pool", host=read_host_ip)
+        # id(connection) -> (connection, {sql: prepared cursor}), the connection is kept to rule out id reuse
+        self.__statements = {}
+        self.__pool = None
+        self.__read_pool = None
+        self.__pool_lock = threading.Lock()
+        self.__local = threading.local()
 
-    def __create_tables(self):
-        cursor = self.conn.cursor()
-        cursor.execute(f"CREATE DATABASE IF NOT EXISTS {self.db_name};")
-        self.conn.database = self.db_name
-        cursor.execute("""
-        CREATE TABLE IF NOT EXISTS `RestaurantOrder` (
-            ID INT AUTO_INCREMENT PRIMARY KEY,
-            Number INT NOT NULL,
-            Entry_Time DATETIME NOT NULL,
-            Exit_Time DATETIME DEFAULT NULL,
-            Status ENUM('Open', 'Closed', 'Cancelled') DEFAULT 'Open',
-            Note TEXT,
-            Payment_Method ENUM('Cash', 'Card', 'Pix', 'Others') DEFAULT NULL,
-            Total_Amount DECIMAL(10, 2) DEFAULT 0.00,
-            Paid BOOLEAN DEFAULT FALSE
-        );""")
-        cursor.execute("""
-        CREATE TABLE IF NOT EXISTS OrderStatusHistory (
-            ID INT AUTO_INCREMENT PRIMARY KEY,
-            RestaurantOrder_ID INT NOT NULL,
-            Status ENUM('Open', 'Closed', 'Cancelled') NOT NULL,
-            Change_Time DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
-            note TEXT,
-            FOREIGN KEY (RestaurantOrder_ID) REFERENCES `RestaurantOrder`(ID)
-        );""")
-        cursor.execute("""
-        CREATE TABLE IF NOT EXISTS Product (
-            ID INT AUTO_INCREMENT PRIMARY KEY,
-            Name VARCHAR(255) NOT NULL,
-            Description TEXT,
-            Price DECIMAL(10, 2) NOT NULL,
-            Category VARCHAR(255),
-            Stock INT NOT NULL,
-            Active BOOLEAN DEFAULT TRUE
-        );""")
-        cursor.execute("""
-        CREATE TABLE IF NOT EXISTS ProductPerKg (
-            ID INT AUTO_INCREMENT PRIMARY KEY,
-            Description TEXT,
-            Weight DECIMAL(10, 2) NOT NULL,
-            PricePerKg DECIMAL(10, 2) NOT NULL,
-            Total DECIMAL(10, 2) GENERATED ALWAYS AS (Weight * PricePerKg) STORED,
-            Category VARCHAR(255)
-        );""")
+        if create_tables:
+            self.bootstrap(host_ip, port, user, password, db_name)
+
+    @classmethod
+    def bootstrap(cls, host_ip: str, port: int, user: str, password: str, db_name: str):
+        # the database may not exist yet, so the schema is created through a plain connection. DDL commits
+        # implicitly, autocommit covers the backfill and the SchemaVersion row without a closing COMMIT
+        conn = mariadb.connect(host=host_ip, port=port, user=user, password=password, autocommit=True,
+                               connect_timeout=_CONNECT_TIMEOUT, client_flag=CLIENT.MULTI_STATEMENTS)
+        try:
+            cls.__create_tables(conn, db_name)
+        finally:
+            conn.close()
+
+    @property
+    def pool(self) -> mariadb.ConnectionPool:
+        if self.__pool is None:
+            with self.__pool_lock:
+                if self.__pool is None:
+                    self.__pool = mariadb.ConnectionPool(**self.__pool_args)
+        return self.__pool
+
+    @property
+    def read_pool(self) -> mariadb.ConnectionPool:
+        if self.__read_pool is None:
+            with self.__pool_lock:
+                if self.__read_pool is None:
+                    self.__read_pool = mariadb.ConnectionPool(**self.__read_pool_args)
+        return self.__read_pool
+
+    @property
+    def conn(self) -> mariadb.Connection:
+        conn = getattr(self.__local, "conn", None)
+        if conn is None:
+            conn = self.pool.get_connection()
+            self.__local.conn = conn
+        return conn
+
+    @property
+    def read_conn(self) -> mariadb.Connection:
+        if self.__read_pool_args is None:
+            return self.conn
+        conn = getattr(self.__local, "read_conn", None)
+        if conn is None:
+            conn = self.read_pool.get_connection()
+            self.__local.read_conn = conn
+        return conn
+
+    def prepared_cursor(self, sql: str):
+        conn = self.conn
+        entry = self.__statements.get(id(conn))
+        if entry is None or entry[0] is not conn:
+            entry = (conn, {})
+            self.__statements[id(conn)] = entry
+
+        # a connection is only used by the thread that checked it out, so its own cache needs no lock
+        statements = entry[1]
+        cursor = statements.get(sql)
+        if cursor is None or cursor.closed:
+            # bounded well below the server's max_prepared_stmt_count, the oldest statement is closed first
+            if len(statements) >= _MAX_PREPARED_PER_CONNECTION:
+                statements.pop(next(iter(statements))).close()
+            cursor = conn.cursor(prepared=True)
+            statements[sql] = cursor
+        return cursor
+
+    @contextmanager
+    def transaction(self):
+        depth = getattr(self.__local, "tx_depth", 0)
+        if depth == 0:
+            self.__local.tx_failed = False
+        self.__local.tx_depth = depth + 1
+        try:
+            yield self
+        except BaseException:
+            self.__local.tx_failed = True
+            raise
+        finally:
+            self.__local.tx_depth = depth
+            # only the outermost block ends the transaction, nested blocks join it
+            if depth == 0:
+                try:
+                    if self.__local.tx_failed:
+                        self.conn.rollback()
+                    else:
+                        self.conn.commit()
+                except mariadb.Error as e:
+                    logger.exception("Error finishing transaction: %s", e)
+                    self.conn.rollback()
+                    # the writes of the block were not persisted, the caller must not report them as done
+                    raise
+
+    def commit(self):
+        # inside transaction() the writes are committed together when the outermost block exits
+        if getattr(self.__local, "tx_depth", 0) == 0:
+            self.conn.commit()
+
+    def rollback(self):
+        if getattr(self.__local, "tx_depth", 0) > 0:
+            # a failed write spoils the whole block, the writes after it are rolled back at exit
+            self.__local.tx_failed = True
+        self.conn.rollback()
+
+    def release(self):
+        for name in ("conn", "read_conn"):
+            conn = getattr(self.__local, name, None)
+            if conn is None:
+                continue
+            setattr(self.__local, name, None)
+            try:
+                conn.rollback()
+            except mariadb.Error as e:
+                logger.exception("Error rolling back pooled connection: %s", e)
+                # statement IDs belong to the server session, a broken or reconnected connection prepares them anew
+                self.__statements.pop(id(conn), None)
+            # closing a pooled connection hands it back to the pool
+            conn.close()
+
+    @classmethod
+    def __create_tables(cls, conn, db_name: str):
+        cursor = conn.cursor()
+        cursor.execute(f"""
+        CREATE DATABASE IF NOT EXISTS {db_name} CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci;
+        USE {db_name};
+        CREATE TABLE IF NOT EXISTS SchemaVersion (
+            ID INT PRIMARY KEY,
+            Schema_Hash CHAR(16) NOT NULL,
+            Applied_At DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP
+        ) {_TABLE_OPTIONS};""")
+        while cursor.nextset():
+            pass
+        cursor.execute("SELECT Schema_Hash FROM SchemaVersion WHERE ID = 1")
+        row = cursor.fetchone()
+        if row and row[0] == _SCHEMA_HASH:
+            cursor.close()
+            return
+
+        cls.__check_open_numbers(cursor, db_name)
+        cls.__migrate_jwt_list(cursor, db_name)
+        # the whole schema goes to the server in one round-trip, the statements are executed in order
+        cursor.execute(_DDL)
+        while cursor.nextset():
+            pass
+        cls.__create_total_triggers(cursor)
+        cursor.execute("REPLACE INTO SchemaVersion (ID, Schema_Hash, Applied_At) VALUES (1, ?, NOW())",
+                       (_SCHEMA_HASH,))
+        cursor.close()
+
+    # uq_open_number cannot be built over a table that already holds two open orders with the same number; the
+    # schema would stop halfway through the batch with a bare duplicate key error, so they are reported up front.
+    # Which of the orders to close is a business decision, they are not merged or closed here
+    @staticmethod
+    def __check_open_numbers(cursor, db_name: str):
         cursor.execute("""
-        CREATE TABLE IF NOT EXISTS KgPrice (
-            ID INT AUTO_INCREMENT PRIMARY KEY,
-            Price DECIMAL(10, 2) NOT NULL,
-            Category VARCHAR(255) NOT NULL
-        );""")
+            SELECT EXISTS (SELECT 1 FROM information_schema.TABLES
+                           WHERE TABLE_SCHEMA = ? AND TABLE_NAME = 'RestaurantOrder'),
+                   EXISTS (SELECT 1 FROM information_schema.STATISTICS
+                           WHERE TABLE_SCHEMA = ? AND TABLE_NAME = 'RestaurantOrder'
+                                 AND INDEX_NAME = 'uq_open_number')
+        """, (db_name, db_name))
+        table_exists, index_exists = cursor.fetchone()
+        if not table_exists or index_exists:
+            return
+
         cursor.execute("""
-        CREATE TABLE IF NOT EXISTS OrderItem (
-            ID INT AUTO_INCREMENT PRIMARY KEY,
-            RestaurantOrderID INT,
-            ProductID INT,
-            ProductPerKgID INT,
-            Quantity INT DEFAULT 1,
-            FOREIGN KEY (RestaurantOrderID) REFERENCES `RestaurantOrder`(ID),
-            FOREIGN KEY (ProductID) REFERENCES Product(ID),
-            FOREIGN KEY (ProductPerKgID) REFERENCES ProductPerKg(ID),
-            CHECK ((ProductID IS NOT NULL AND ProductPerKgID IS NULL) OR (ProductPerKgID IS NOT NULL AND ProductID IS NULL))
-        );""")
+            SELECT Number FROM RestaurantOrder WHERE Status = 'Open'
+            GROUP BY Number HAVING COUNT(*) > 1 ORDER BY Number
+        """)
+        duplicates = [row[0] for row in cursor.fetchall()]
+        if duplicates:
+            raise RuntimeError(
+                f"Cannot create uq_open_number: several open orders share the numbers {duplicates}. "
+                f"Close or cancel the extra open orders of each number, then run the bootstrap again.")
+
+    # JWTList tables from older schemas are keyed by user_id alone (one refresh token per user) and store the whole
+    # token in a utf8mb4 VARCHAR(2047), too long for a primary key. Their rows are tokens the refresh route, which
+    # compares jtis, can never match again, so they are dropped before the column is narrowed to a jti and the
+    # table re-keyed per session. The table is only rebuilt when one of the two is still outdated
+    @staticmethod
+    def __migrate_jwt_list(cursor, db_name: str):
         cursor.execute("""
-        CREATE TABLE IF NOT EXISTS `User` (
-            ID INT AUTO_INCREMENT PRIMARY KEY,
-            Name VARCHAR(255) NOT NULL,
-            Username VARCHAR(255) NOT NULL UNIQUE,
-            Email VARCHAR(255) NOT NULL UNIQUE,
-            PasswordHash VARCHAR(255) NOT NULL,
-            Role ENUM('Admin', 'Waiter', 'Cook', 'Cashier') DEFAULT 'Cashier',
-            Active BOOLEAN DEFAULT TRUE
-        );""")
+            SELECT COLUMN_TYPE, CHARACTER_SET_NAME FROM information_schema.COLUMNS
+            WHERE TABLE_SCHEMA = ? AND TABLE_NAME = 'JWTList' AND COLUMN_NAME = 'jti'
+        """, (db_name,))
+        column = cursor.fetchone()
+        if column is None:
+            return
         cursor.execute("""
-        CREATE TABLE IF NOT EXISTS  JWTList (
-            user_id INT NOT NULL PRIMARY KEY, 
-            jti VARCHAR(2047) NOT NULL UNIQUE, 
-            expires_at TIMESTAMP NOT NULL, 
-            CONSTRAINT fk_user FOREIGN KEY (user_id) REFERENCES User(ID)
-        );""")
-
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_username ON User (Username);")
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_jti ON JWTList (jti);")
-        self.conn.commit()
-        cursor.close()
+            SELECT COLUMN_NAME FROM information_schema.STATISTICS
+            WHERE TABLE_SCHEMA = ? AND TABLE_NAME = 'JWTList' AND INDEX_NAME = 'PRIMARY'
+            ORDER BY SEQ_IN_INDEX
+        """, (db_name,))
+        primary_key = [row[0] for row in cursor.fetchall()]
 
-    @property
+        changes = []
+        if tuple(column) != ("char(36)", "ascii"):
+            cursor.execute("DELETE FROM JWTList WHERE CHAR_LENGTH(jti) <> 36")
+            changes.append("MODIFY jti CHAR(36) CHARACTER SET ascii NOT NULL")
+        if primary_key != ["user_id", "jti"]:
+            changes.append("DROP PRIMARY KEY, ADD PRIMARY KEY (user_id, jti)")
+        if changes:
+            cursor.execute(f"ALTER TABLE JWTList {', '.join(changes)}")
+
+    # Keeps RestaurantOrder.Total_Amount in sync with its items and their prices, so reading a total is a single
+    # column fetch. Only reached when the schema hash changed; CREATE OR REPLACE swaps triggers from older schemas
+    @staticmethod
+    def __create_total_triggers(cursor):
+        # the triggers and the re-sum of the open orders are sent as one batch
+        cursor.execute(_TOTAL_TRIGGERS_DDL)
+        while cursor.nextset():
+            pass
+
+    # Repositories only hold a reference to this DB and resolve the connection per call, so one instance
+    # of each is shared by every thread
+    @cached_property
     def restaurant_order_repository(self):
         return RestaurantOrderRepository(self)
 
-    @property
+    @cached_property
     def user_repository(self):
         return UserRepository(self)
 
-    @property
+    @cached_property
     def product_repository(self):
         return ProductRepository(self)
 
-    @property
+    @cached_property
     def product_per_kg_repository(self):
         return ProductPerKgRepository(self)
 
-    @property
+    @cached_property
     def order_status_history_repository(self):
         return OrderStatusHistoryRepository(self)
 
-    @property
+    @cached_property
     def order_item_repository(self):
         return OrderItemRepository(self)
 
-    @property
+    @cached_property
     def jwt_list_repository(self):
         return JWTListRepository(self)
 
-    @property
+    @cached_property
     def kg_price_repository(self):
         return KgPriceRepository(self)
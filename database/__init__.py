@@ -1,30 +1,52 @@
 """
 Module for initializing the database connection for a restaurant management system.
 
-This module loads environment variables from a .env file to configure the database
-connection and creates an instance of the DB class for interacting with the database.
+This module exposes `db`, the instance of the DB class for interacting with the database. It is created
+lazily, on first access, from the settings read once from the environment (and the .env file) through
+`database.config.load_db_config`; merely importing the package reads no settings and opens no connection.
+The size of the connection pool is read from `db_pool_size` (default 5). Importing this module does not
+create the tables: run `python -m database.bootstrap` once, or set `db_create_tables=true` to do it on startup.
+Building `db` also starts `database.logs`, which writes the errors logged by DB and the repositories to stderr
+from a background thread.
 
 Dependencies:
     os: Standard library module for interacting with the operating system.
-    dotenv: Library for loading environment variables from a .env file.
+    database.config: Imports the cached loader of the database settings.
     database.objects: Imports various data classes and enums used in the application.
-    database.repositorys: Imports repository classes for data access.
-    database.DB: Imports the DB class for managing database connections and operations.
+    database.DB: Imports the DB class for managing database connections and operations; the repositories
+                 are reached through its properties.
+    database.logs: Imported when `db` is built, moves the output of the database loggers off the request threads.
 """
 import os
 
-import dotenv
-
+from database.config import DBConfig, load_db_config
 from database.objects import *
-from database.repositorys import *
 from database.DB import DB
 
-dotenv.load_dotenv()
+# Everything imported above, plus the lazily built `db`, is what `from database import *` exports
+__all__ = [name for name in globals() if not name.startswith("_")] + ["db"]
+
+
+# PEP 562 hook: the settings are read and DB is built on the first access to `database.db`, so importing
+# `database.objects` or the validators needs neither a .env file nor a database
+def __getattr__(name):
+    if name == "db":
+        # imported here, after __all__ is computed, so the helper is not exported
+        from database.logs import start_error_log
+        start_error_log()
 
-db = DB(
-    host_ip=os.getenv("db_host_ip"),
-    port=int(os.getenv("db_port")),
-    user=os.getenv("db_user"),
-    password=os.getenv("db_password"),
-    db_name=os.getenv("db_name")
-)
+        config = load_db_config()
+        db = DB(
+            host_ip=config.host_ip,
+            port=config.port,
+            user=config.user,
+            password=config.password,
+            db_name=config.db_name,
+            pool_size=config.pool_size,
+            create_tables=config.create_tables,
+            read_host_ip=config.read_host_ip
+        )
+        # later lookups find the instance directly and never reach this hook again
+        globals()["db"] = db
+        return db
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
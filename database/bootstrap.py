@@ -0,0 +1,27 @@
+"""
+One-shot schema setup for the restaurant management system.
+
+Creates the database together with its tables, indexes and triggers, using the same `.env` settings as
+the application. Every statement is idempotent, so running it again after an update only adds what is
+missing. Run it once per deploy, before starting the server:
+
+    python -m database.bootstrap
+"""
+from database.DB import DB
+from database.config import load_db_config
+
+
+def main():
+    config = load_db_config()
+    DB.bootstrap(
+        host_ip=config.host_ip,
+        port=config.port,
+        user=config.user,
+        password=config.password,
+        db_name=config.db_name
+    )
+    print(f"Database {config.db_name} is ready")
+
+
+if __name__ == '__main__':
+    main()
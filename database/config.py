@@ -0,0 +1,59 @@
+"""
+Module reading the database settings of the restaurant management system.
+
+Classes:
+    DBConfig (dataclass): Frozen snapshot of the database settings read from the environment.
+
+Functions:
+    load_db_config() -> DBConfig: Reads the settings once per process.
+
+Importing this module loads the `.env` file into os.environ, so the JWT, security and cache settings read at
+import time by `utils` and the routes (which all import `database`) see it too.
+"""
+import os
+from dataclasses import dataclass
+from functools import lru_cache
+
+import dotenv
+
+dotenv.load_dotenv()
+
+
+@dataclass(frozen=True)
+class DBConfig:
+    """Frozen snapshot of the database settings.
+
+        Attributes:
+            host_ip (str): Host of the MariaDB server (`db_host_ip`).
+            port (int): Port of the MariaDB server (`db_port`).
+            user (str): Database user (`db_user`).
+            password (str): Password of the database user (`db_password`).
+            db_name (str): Name of the database (`db_name`).
+            pool_size (int): Connections kept by each process (`db_pool_size`, default 5).
+            create_tables (bool): Whether the tables are created on startup (`db_create_tables`, default false).
+            read_host_ip (str | None): Host of a read replica for listings and statistics (`db_read_host_ip`),
+                                       None to send every query to the primary.
+    """
+    host_ip: str
+    port: int
+    user: str
+    password: str
+    db_name: str
+    pool_size: int = 5
+    create_tables: bool = False
+    read_host_ip: str | None = None
+
+
+@lru_cache(maxsize=1)
+def load_db_config() -> DBConfig:
+    env = os.environ
+    return DBConfig(
+        host_ip=env.get("db_host_ip"),
+        port=int(env.get("db_port")),
+        user=env.get("db_user"),
+        password=env.get("db_password"),
+        db_name=env.get("db_name"),
+        pool_size=int(env.get("db_pool_size", "5")),
+        create_tables=env.get("db_create_tables", "false").lower() == "true",
+        read_host_ip=env.get("db_read_host_ip") or None
+    )
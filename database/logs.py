@@ -0,0 +1,35 @@
+"""
+Background output for the database loggers.
+
+Functions:
+    start_error_log(): Sends the records of the `database` loggers through a queue to a background thread that
+        writes them to stderr, so a burst of database errors never blocks the request threads on the stream.
+"""
+import atexit
+import logging
+import queue
+import threading
+from logging.handlers import QueueHandler, QueueListener
+
+_listener = None
+_listener_lock = threading.Lock()
+
+
+def start_error_log():
+    global _listener
+    with _listener_lock:
+        if _listener is not None:
+            return
+
+        records = queue.SimpleQueue()
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+        _listener = QueueListener(records, handler)
+        _listener.start()
+        # flushes what is still queued when the worker exits
+        atexit.register(_listener.stop)
+
+        # request threads only enqueue the record, the listener thread does the write
+        logger = logging.getLogger("database")
+        logger.addHandler(QueueHandler(records))
+        logger.propagate = False
@@ -9,7 +9,7 @@ from dataclasses import dataclass
 from datetime import datetime
 
 
-@dataclass
+@dataclass(slots=True)
 class JWTItem:
     """Data class representing a JSON Web Token (JWT) item.
 
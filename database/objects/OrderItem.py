@@ -1,6 +1,9 @@
 """
 Module defining an OrderItem data class for restaurant orders.
 
+Enums:
+    AddItemStatus: Enum representing the outcome of adding an item to an open restaurant order.
+
 Classes:
     OrderItem (dataclass): Data class representing an item in a restaurant order, including
                            attributes for the order ID, quantity, unique ID, and product IDs.
@@ -8,9 +11,18 @@ Classes:
                            must be provided, but not both.
 """
 from dataclasses import dataclass, field
+from enum import Enum
+
 
+class AddItemStatus(Enum):
+    """Enum representing the outcome of adding an item to an open restaurant order."""
+    ADDED = 'Added'
+    ORDER_NOT_FOUND = 'OrderNotFound'
+    PRODUCT_NOT_FOUND = 'ProductNotFound'
+    ERROR = 'Error'
 
-@dataclass
+
+@dataclass(slots=True)
 class OrderItem:
     """Data class representing an item in a restaurant order.
 
@@ -31,5 +43,12 @@ class OrderItem:
     product_per_kg_id: int = field(default=None)
 
     def __post_init__(self):
-        if (self.product_id is not None and self.product_per_kg_id is not None) or (self.product_id is None and self.product_per_kg_id is None):
-            raise ValueError("Either 'product_id' or 'product_per_kg_id' must be provided, but not both.")
\ No newline at end of file
+        if (self.product_id is None) == (self.product_per_kg_id is None):
+            raise ValueError("Either 'product_id' or 'product_per_kg_id' must be provided, but not both.")
+
+    @classmethod
+    def from_row(cls, row: tuple) -> 'OrderItem':
+        """Builds an OrderItem from a row in field order, skipping the check the OrderItem table already enforces."""
+        item = object.__new__(cls)
+        item.restaurant_order_id, item.quantity, item.id, item.product_id, item.product_per_kg_id = row
+        return item
\ No newline at end of file
@@ -8,7 +8,7 @@ Classes:
 from dataclasses import dataclass, field
 
 
-@dataclass
+@dataclass(slots=True)
 class Product:
     """Data class representing a product in the inventory system.
 
@@ -11,7 +11,7 @@ Classes:
 from dataclasses import dataclass, field
 
 
-@dataclass
+@dataclass(slots=True)
 class ProductPerKg:
     """Data class representing a product sold by weight.
 
@@ -36,8 +36,16 @@ class ProductPerKg:
     def __post_init__(self):
         self.total = float(self.weight) * float(self.price_per_kg)
 
+    @classmethod
+    def from_row(cls, row: tuple) -> 'ProductPerKg':
+        """Builds a ProductPerKg from a row in field order ending with the stored `Total`, skipping `__post_init__`."""
+        product = object.__new__(cls)
+        product.weight, product.price_per_kg, product.id, product.description, product.category, total = row
+        product.total = float(total)
+        return product
 
-@dataclass
+
+@dataclass(slots=True)
 class KgPrice:
     """Data class representing a price for a product per kilogram.
 
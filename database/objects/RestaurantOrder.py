@@ -5,6 +5,7 @@ Enums:
     OrderStatus: Enum representing the possible statuses of a restaurant order (Open, Closed, Cancelled).
     PaymentMethod: Enum representing the available payment methods for a restaurant order
                    (Cash, Card, Pix, Others).
+    CheckinStatus: Enum representing the outcome of opening a new restaurant order.
 
 Classes:
     RestaurantOrder (dataclass): Data class representing a restaurant order, including attributes
@@ -16,8 +17,11 @@ Classes:
 """
 from dataclasses import dataclass, field
 from datetime import datetime
+from decimal import Decimal
 from enum import Enum
 
+from database.time_utils import utc_now
+
 
 class OrderStatus(Enum):
     """Enum representing the possible statuses of a restaurant order."""
@@ -25,6 +29,15 @@ class OrderStatus(Enum):
     CLOSED = 'Closed'
     CANCELLED = 'Cancelled'
 
+    @classmethod
+    def from_db(cls, value: str) -> 'OrderStatus':
+        """Returns the status stored as `value` in a `Status` ENUM column."""
+        return _STATUS_BY_DB[value]
+
+
+# The ENUM columns return the member values verbatim, so each row maps to its status with one dict lookup
+_STATUS_BY_DB = {status.value: status for status in OrderStatus}
+
 
 class PaymentMethod(Enum):
     """Enum representing the available payment methods for a restaurant order."""
@@ -34,7 +47,14 @@ class PaymentMethod(Enum):
     OTHERS = 'Others'
 
 
-@dataclass
+class CheckinStatus(Enum):
+    """Enum representing the outcome of opening a new restaurant order."""
+    CREATED = 'Created'
+    NUMBER_IN_USE = 'NumberInUse'
+    ERROR = 'Error'
+
+
+@dataclass(slots=True)
 class RestaurantOrder:
     """Data class representing a restaurant order.
 
@@ -46,7 +66,8 @@ class RestaurantOrder:
             status (OrderStatus, optional): The current status of the order. Defaults to OPEN.
             note (str, optional): Any additional notes related to the order. Defaults to an empty string.
             payment_method (PaymentMethod, optional): The method of payment used for the order. Defaults to None.
-            total_amount (float, optional): The total amount for the order. Defaults to 0.00.
+            total_amount (Decimal, optional): The total amount for the order, as the DECIMAL column returns it.
+                Defaults to 0.00.
             paid (bool, optional): Indicates if the order has been paid. Defaults to False.
     """
     number: int
@@ -56,23 +77,23 @@ class RestaurantOrder:
     status: OrderStatus = field(default=OrderStatus.OPEN)
     note: str = field(default='')
     payment_method: PaymentMethod = field(default=None)
-    total_amount: float = field(default=0.00)
+    total_amount: Decimal = field(default=Decimal('0.00'))
     paid: bool = field(default=False)
 
 
-@dataclass
+@dataclass(slots=True)
 class OrderStatusHistory:
     """Data class representing the history of status changes for a restaurant order.
 
         Attributes:
             restaurant_order_id (int): The ID of the associated restaurant order.
             status (OrderStatus): The status of the order at the time of the change.
-            change_time (datetime, optional): The time when the status was changed. Defaults to the current time.
+            change_time (datetime, optional): The time when the status was changed. Defaults to the current UTC time.
             id (int, optional): Unique identifier for the status history entry. Defaults to None.
             note (str, optional): Any additional notes related to the status change. Defaults to an empty string.
     """
     restaurant_order_id: int
     status: OrderStatus
-    change_time: datetime = field(default_factory=datetime.now)
+    change_time: datetime = field(default_factory=utc_now)
     id: int = field(default=None)
     note: str = field(default='')
\ No newline at end of file
@@ -17,8 +17,17 @@ class UserRole(Enum):
     COOK = 'Cook'
     CASHIER = 'Cashier'
 
+    @classmethod
+    def from_db(cls, value: str) -> 'UserRole':
+        """Returns the role stored as `value` in the `Role` ENUM column."""
+        return _ROLE_BY_DB[value]
 
-@dataclass
+
+# The ENUM column returns the member values verbatim, so each row maps to its role with one dict lookup
+_ROLE_BY_DB = {role.value: role for role in UserRole}
+
+
+@dataclass(slots=True)
 class User:
     """Data class representing a user in the system.
 
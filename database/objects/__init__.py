@@ -4,19 +4,21 @@ Module importing data classes and enums for a restaurant management system.
 Imports:
     JWTItem: Data class for handling JSON Web Tokens.
     OrderItem: Data class representing an item in a restaurant order.
+    AddItemStatus: Enum for the outcome of adding an item to an open restaurant order.
     Product: Data class for representing products in the inventory.
     ProductPerKg: Data class for products sold by weight.
     KgPrice: Data class representing the price per kilogram of a product.
     RestaurantOrder: Data class representing a restaurant order, along with related enums.
     PaymentMethod: Enum for available payment methods in restaurant orders.
+    CheckinStatus: Enum for the outcome of opening a new restaurant order.
     OrderStatusHistory: Data class for tracking the status history of restaurant orders.
     OrderStatus: Enum for the possible statuses of a restaurant order.
     User: Data class representing a user in the system.
     UserRole: Enum representing various user roles in the system.
 """
 from database.objects.JWTItem import JWTItem
-from database.objects.OrderItem import OrderItem
+from database.objects.OrderItem import OrderItem, AddItemStatus
 from database.objects.Product import Product
 from database.objects.ProductPerKg import ProductPerKg, KgPrice
-from database.objects.RestaurantOrder import RestaurantOrder, PaymentMethod, OrderStatusHistory, OrderStatus
+from database.objects.RestaurantOrder import RestaurantOrder, PaymentMethod, OrderStatusHistory, OrderStatus, CheckinStatus
 from database.objects.User import User, UserRole
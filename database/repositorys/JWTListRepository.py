@@ -6,10 +6,21 @@ This module provides a repository for managing JSON Web Token (JWT) items in a M
 Classes:
     JWTListRepository: Handles CRUD operations for JWT items in the `JWTList` table.
 """
+import logging
+from datetime import datetime
+
 import mariadb
 
 from database import JWTItem
 
+logger = logging.getLogger(__name__)
+
+# Statements run through DB.prepared_cursor: parsed and planned once per pooled connection
+_INSERT = "INSERT INTO `JWTList` (jti, user_id, expires_at) VALUES (?, ?, ?)"
+_UPSERT = _INSERT + " ON DUPLICATE KEY UPDATE expires_at = VALUES(expires_at)"
+_EXISTS_BY_JTI = "SELECT 1 FROM `JWTList` WHERE jti = ? LIMIT 1"
+_DELETE_BY_USER_ID = "DELETE FROM `JWTList` WHERE user_id = ?"
+
 
 class JWTListRepository:
     """
@@ -17,55 +28,74 @@ class JWTListRepository:
 
         Methods:
             insert(jwt: JWTItem) -> bool: Inserts a new JWT item into the database.
+            upsert(jwt: JWTItem) -> bool: Inserts a JWT item, or refreshes the expiration of an existing one, in a
+                                          single statement.
             exists_by_jti(jti: str) -> bool: Checks if a JWT with the specified JTI exists.
             delete_by_user_id(user_id: int) -> bool: Deletes JWT items associated with a given user ID.
+            delete_expired(now: datetime, batch: int) -> int: Deletes the expired JWT items in batches and
+                                                              returns how many were removed.
     """
     def __init__(self, db):
         self.db = db
 
+    # the prepared cursors stay open on the connection, so the methods using them do not close them
     def insert(self, jwt: JWTItem) -> bool:
-        cursor = self.db.conn.cursor()
+        cursor = self.db.prepared_cursor(_INSERT)
         try:
-            cursor.execute("""
-                INSERT INTO `JWTList` (jti, user_id, expires_at)
-                VALUES (?, ?, ?)
-            """, (jwt.jti, jwt.user_id, jwt.expires_at))
-            self.db.conn.commit()
+            cursor.execute(_INSERT, (jwt.jti, jwt.user_id, jwt.expires_at))
+            self.db.commit()
             return True
         except mariadb.Error as e:
-            print(f"Error inserting JWT: {e}")
-            self.db.conn.rollback()
+            logger.exception("Error inserting JWT: %s", e)
+            self.db.rollback()
+            return False
+
+    def upsert(self, jwt: JWTItem) -> bool:
+        cursor = self.db.prepared_cursor(_UPSERT)
+        try:
+            cursor.execute(_UPSERT, (jwt.jti, jwt.user_id, jwt.expires_at))
+            self.db.commit()
+            return True
+        except mariadb.Error as e:
+            logger.exception("Error upserting JWT: %s", e)
+            self.db.rollback()
             return False
-        finally:
-            cursor.close()
 
     def exists_by_jti(self, jti: str) -> bool:
-        cursor = self.db.conn.cursor()
+        cursor = self.db.prepared_cursor(_EXISTS_BY_JTI)
         try:
-            cursor.execute(""" 
-                SELECT EXISTS (
-                    SELECT 1 
-                    FROM `JWTList` 
-                    WHERE jti = ?
-                )
-            """, (jti,))
-            exists = cursor.fetchone()[0]
-            return bool(exists)
+            cursor.execute(_EXISTS_BY_JTI, (jti,))
+            return cursor.fetchone() is not None
         except mariadb.Error as e:
-            print(f"Error checking existence of JWT by jti: {e}")
+            logger.exception("Error checking existence of JWT by jti: %s", e)
             return False
-        finally:
-            cursor.close()
 
     def delete_by_user_id(self, user_id: int) -> bool:
-        cursor = self.db.conn.cursor()
+        cursor = self.db.prepared_cursor(_DELETE_BY_USER_ID)
         try:
-            cursor.execute("DELETE FROM `JWTList` WHERE user_id = ?", (user_id,))
-            self.db.conn.commit()
+            cursor.execute(_DELETE_BY_USER_ID, (user_id,))
+            self.db.commit()
             return True
         except mariadb.Error as e:
-            print(f"Error deleting JWT by user_id: {e}")
-            self.db.conn.rollback()
+            logger.exception("Error deleting JWT by user_id: %s", e)
+            self.db.rollback()
             return False
+
+    def delete_expired(self, now: datetime, batch: int = 1_000) -> int:
+        cursor = self.db.conn.cursor()
+        deleted = 0
+        try:
+            # bounded batches keep each transaction, and the locks it holds, short
+            while True:
+                cursor.execute("DELETE FROM `JWTList` WHERE expires_at < ? LIMIT ?", (now, batch))
+                affected = cursor.rowcount
+                self.db.commit()
+                deleted += affected
+                if affected < batch:
+                    return deleted
+        except mariadb.Error as e:
+            logger.exception("Error deleting expired JWTs: %s", e)
+            self.db.rollback()
+            return deleted
         finally:
             cursor.close()
@@ -8,10 +8,14 @@ and check the existence of kg price records.
 Classes:
     KgPriceRepository: A repository for CRUD operations on KgPrice records.
 """
+import logging
+
 import mariadb
 
 from database import KgPrice
 
+logger = logging.getLogger(__name__)
+
 
 class KgPriceRepository:
     """
@@ -41,11 +45,11 @@ class KgPriceRepository:
             """, (kg_price.price, kg_price.category))
 
             kg_price.id = cursor.lastrowid
-            self.db.conn.commit()
+            self.db.commit()
             return True
         except mariadb.Error as e:
-            print(f"Error inserting kg price: {e}")
-            self.db.conn.rollback()
+            logger.exception("Error inserting kg price: %s", e)
+            self.db.rollback()
             return False
         finally:
             cursor.close()
@@ -68,7 +72,7 @@ class KgPriceRepository:
                 )
             return None
         except mariadb.Error as e:
-            print(f"Error fetching kg price by ID: {e}")
+            logger.exception("Error fetching kg price by ID: %s", e)
             return None
         finally:
             cursor.close()
@@ -77,17 +81,15 @@ class KgPriceRepository:
         cursor = self.db.conn.cursor()
         try:
             cursor.execute("""
-                SELECT ID, Price, Category
+                SELECT Price, ID, Category
                 FROM `KgPrice`
             """)
-            for row in cursor:
-                yield KgPrice(
-                    id=row[0],
-                    price=row[1],
-                    category=row[2]
-                )
+            # rows come in the dataclass field order, so they are built positionally in batches
+            while batch := cursor.fetchmany(1024):
+                for row in batch:
+                    yield KgPrice(*row)
         except mariadb.Error as e:
-            print(f"Error fetching all kg prices: {e}")
+            logger.exception("Error fetching all kg prices: %s", e)
         finally:
             cursor.close()
 
@@ -105,7 +107,7 @@ class KgPriceRepository:
                     category=row[2]
                 )
         except mariadb.Error as e:
-            print(f"Error fetching all kg prices: {e}")
+            logger.exception("Error fetching all kg prices: %s", e)
         finally:
             cursor.close()
 
@@ -113,11 +115,11 @@ class KgPriceRepository:
         cursor = self.db.conn.cursor()
         try:
             cursor.execute("DELETE FROM `KgPrice` WHERE ID = ?", (kg_price_id,))
-            self.db.conn.commit()
+            self.db.commit()
             return True, cursor.rowcount
         except mariadb.Error as e:
-            print(f"Error deleting kg price by ID: {e}")
-            self.db.conn.rollback()
+            logger.exception("Error deleting kg price by ID: %s", e)
+            self.db.rollback()
             return False, 0
         finally:
             cursor.close()
@@ -129,11 +131,11 @@ class KgPriceRepository:
                 UPDATE `KgPrice` SET Price = ?, Category = ?
                 WHERE ID = ?
             """, (kg_price.price, kg_price.category, kg_price.id))
-            self.db.conn.commit()
+            self.db.commit()
             return True
         except mariadb.Error as e:
-            print(f"Error updating kg price: {e}")
-            self.db.conn.rollback()
+            logger.exception("Error updating kg price: %s", e)
+            self.db.rollback()
             return False
         finally:
             cursor.close()
@@ -149,7 +151,7 @@ class KgPriceRepository:
             """, (kg_price_id,))
             return cursor.fetchone() is not None
         except mariadb.Error as e:
-            print(f"Error checking existence of kg price by ID: {e}")
+            logger.exception("Error checking existence of kg price by ID: %s", e)
             return False
         finally:
             cursor.close()
@@ -6,9 +6,62 @@ This module provides a repository for managing OrderItem records in a MariaDB da
 Classes:
     OrderItemRepository: Handles CRUD operations for OrderItem entries in the `OrderItem` table.
 """
+import logging
+
 import mariadb
 
-from database import OrderItem
+from database import OrderItem, AddItemStatus
+
+logger = logging.getLogger(__name__)
+
+# Statements run through DB.prepared_cursor: parsed and planned once per pooled connection
+_INSERT = """
+    INSERT INTO `OrderItem` (RestaurantOrderID, ProductID, ProductPerKgID, Quantity)
+    VALUES (?, ?, ?, ?)
+"""
+# The open order is locked first and the item insert only reads the product: the OrderItem triggers update
+# RestaurantOrder, which a trigger may not do while the invoking statement reads that table (error 1442)
+_LOCK_OPEN_ORDER = "SELECT ID FROM RestaurantOrder WHERE Number = ? AND Status = 'Open' FOR UPDATE"
+_ADD_PRODUCT = """
+    INSERT INTO `OrderItem` (RestaurantOrderID, ProductID, Quantity)
+    SELECT ?, ID, ? FROM Product WHERE ID = ?
+    RETURNING ID
+"""
+_ADD_PRODUCT_PER_KG = """
+    INSERT INTO `OrderItem` (RestaurantOrderID, ProductPerKgID, Quantity)
+    SELECT ?, ID, ? FROM ProductPerKg WHERE ID = ?
+    RETURNING ID
+"""
+_DECREMENT_STOCK = "UPDATE `Product` SET Stock = Stock - ? WHERE ID = ?"
+_SELECT_BY_ID = """
+    SELECT RestaurantOrderID, Quantity, ID, ProductID, ProductPerKgID
+    FROM `OrderItem`
+    WHERE ID = ?
+"""
+_SELECT_BY_ORDER_ID = """
+    SELECT RestaurantOrderID, Quantity, ID, ProductID, ProductPerKgID
+    FROM `OrderItem`
+    WHERE RestaurantOrderID = ?
+"""
+_DELETE_BY_ID = "DELETE FROM `OrderItem` WHERE ID = ?"
+_UPDATE = """
+    UPDATE `OrderItem`
+    SET RestaurantOrderID = ?, ProductID = ?, ProductPerKgID = ?, Quantity = ?
+    WHERE ID = ?
+"""
+
+_SELECT_ITEMS_WITH_TOTAL = """
+    SELECT OrderItem.ProductID, OrderItem.Quantity, Product.Name, Product.Category, Product.Price,
+           (OrderItem.Quantity * Product.Price),
+           OrderItem.ProductPerKgID, ProductPerKg.Weight, ProductPerKg.PricePerKg,
+           (ProductPerKg.Weight * ProductPerKg.PricePerKg), ProductPerKg.Category,
+           RestaurantOrder.Total_Amount
+    FROM RestaurantOrder
+    LEFT JOIN OrderItem ON OrderItem.RestaurantOrderID = RestaurantOrder.ID
+    LEFT JOIN Product ON OrderItem.ProductID = Product.ID
+    LEFT JOIN ProductPerKg ON OrderItem.ProductPerKgID = ProductPerKg.ID
+    WHERE RestaurantOrder.Number = ? AND RestaurantOrder.Status = 'Open'
+"""
 
 
 class OrderItemRepository:
@@ -20,153 +73,153 @@ class OrderItemRepository:
 
         Methods:
             insert(order_item: OrderItem) -> bool: Inserts a new order item into the database.
+            add_item_atomic(order_number: int, product_id: int, product_per_kg_id: int, quantity: int)
+                -> (AddItemStatus, OrderItem | None): Adds an item to an open order and decrements the product stock
+                in a single transaction.
             select_by_id(order_item_id: int) -> OrderItem | None: Retrieves an order item by its ID.
-            select_all_items_special_format(order_id: int) -> tuple | None: Retrieves order items in a special format for a specific restaurant order.
-            select_by_order_id(restaurant_order_id: int): Yields all order items associated with a given restaurant order ID.
+            select_items_with_total(order_number: int) -> tuple | None: Retrieves, in a single query, whether an open order
+                exists for the number, its items in the special format and the order total.
+            select_by_order_id(restaurant_order_id: int) -> list[OrderItem]: Returns all order items associated with a
+                given restaurant order ID, read eagerly in one fetch.
             delete_by_id(order_item_id: int) -> bool: Deletes an order item by its ID.
             update(order_item: OrderItem) -> bool: Updates an existing order item's details in the database.
         """
     def __init__(self, db):
         self.db = db
 
+    # the prepared cursors stay open on the connection, so the methods using them do not close them
     def insert(self, order_item: OrderItem) -> bool:
-        cursor = self.db.conn.cursor()
+        cursor = self.db.prepared_cursor(_INSERT)
         try:
-            cursor.execute("""
-                INSERT INTO `OrderItem` (RestaurantOrderID, ProductID, ProductPerKgID, Quantity)
-                VALUES (?, ?, ?, ?)
-            """, (order_item.restaurant_order_id,
-                  order_item.product_id,
-                  order_item.product_per_kg_id,
-                  order_item.quantity))
+            cursor.execute(_INSERT, (order_item.restaurant_order_id,
+                                     order_item.product_id,
+                                     order_item.product_per_kg_id,
+                                     order_item.quantity))
 
             order_item.id = cursor.lastrowid
-            self.db.conn.commit()
+            self.db.commit()
             return True
         except mariadb.Error as e:
-            print(f"Error inserting order item: {e}")
-            self.db.conn.rollback()
+            logger.exception("Error inserting order item: %s", e)
+            self.db.rollback()
             return False
-        finally:
-            cursor.close()
+
+    def add_item_atomic(self, order_number: int, product_id: int = None, product_per_kg_id: int = None,
+                        quantity: int = 1) -> (AddItemStatus, OrderItem | None):
+        sql = _ADD_PRODUCT if product_id is not None else _ADD_PRODUCT_PER_KG
+        try:
+            # the lock keeps a concurrent checkout from closing the order before the item is in
+            cursor = self.db.prepared_cursor(_LOCK_OPEN_ORDER)
+            cursor.execute(_LOCK_OPEN_ORDER, (order_number,))
+            order_row = cursor.fetchone()
+            if order_row is None:
+                self.db.rollback()
+                return AddItemStatus.ORDER_NOT_FOUND, None
+            order_id = order_row[0]
+
+            # the product is validated by the INSERT ... SELECT itself
+            cursor = self.db.prepared_cursor(sql)
+            cursor.execute(sql, (order_id, quantity, product_id if product_id is not None else product_per_kg_id))
+            row = cursor.fetchone()
+            if row is None:
+                self.db.rollback()
+                return AddItemStatus.PRODUCT_NOT_FOUND, None
+
+            if product_id is not None:
+                self.db.prepared_cursor(_DECREMENT_STOCK).execute(_DECREMENT_STOCK, (quantity, product_id))
+            self.db.commit()
+
+            return AddItemStatus.ADDED, OrderItem(
+                id=row[0],
+                restaurant_order_id=order_id,
+                quantity=quantity,
+                product_id=product_id,
+                product_per_kg_id=product_per_kg_id
+            )
+        except mariadb.Error as e:
+            logger.exception("Error adding order item: %s", e)
+            self.db.rollback()
+            return AddItemStatus.ERROR, None
 
     def select_by_id(self, order_item_id: int) -> OrderItem | None:
-        cursor = self.db.conn.cursor()
+        cursor = self.db.prepared_cursor(_SELECT_BY_ID)
         try:
-            cursor.execute("""
-                SELECT ID, RestaurantOrderID, ProductID, ProductPerKgID, Quantity
-                FROM `OrderItem`
-                WHERE ID = ?
-            """, (order_item_id,))
+            cursor.execute(_SELECT_BY_ID, (order_item_id,))
             row = cursor.fetchone()
 
             if row:
-                return OrderItem(
-                    id=row[0],
-                    restaurant_order_id=row[1],
-                    product_id=row[2],
-                    product_per_kg_id=row[3],
-                    quantity=row[4]
-                )
+                return OrderItem.from_row(row)
             return None
         except mariadb.Error as e:
-            print(f"Error fetching order item by ID: {e}")
+            logger.exception("Error fetching order item by ID: %s", e)
             return None
-        finally:
-            cursor.close()
 
-    def select_all_items_special_format(self, order_id: int) -> tuple | None:
-        cursor = self.db.conn.cursor()
+    def select_items_with_total(self, order_number: int) -> tuple | None:
+        # hot point lookup, the cursor stays prepared on the connection and is not closed
+        cursor = self.db.prepared_cursor(_SELECT_ITEMS_WITH_TOTAL)
         try:
-            cursor.execute("""
-                SELECT Name, Category, Price, Quantity, Product.ID FROM OrderItem 
-                INNER JOIN RestaurantOrder ON RestaurantOrder.ID = OrderItem.RestaurantOrderID 
-                INNER JOIN Product ON OrderItem.ProductID = Product.ID WHERE RestaurantOrder.ID = ?;
-            """, (order_id,))
-            items = []
-            for row in cursor:
-                item = {
-                    "Name": row[0],
-                    "Category": row[1],
-                    "Price": row[2],
-                    "Quantity": row[3],
-                    "ProductID": row[4]
-                }
-                items.append(item)
+            cursor.execute(_SELECT_ITEMS_WITH_TOTAL, (order_number,))
+            rows = cursor.fetchall()
+            if not rows:
+                return False, [], [], 0
 
+            items = []
             items_per_kg = []
-            cursor.execute("""
-                SELECT Weight, PricePerKg, (Weight * PricePerKg), Category, ProductPerKg.ID FROM OrderItem 
-                INNER JOIN RestaurantOrder ON RestaurantOrder.ID = OrderItem.RestaurantOrderID 
-                INNER JOIN ProductPerKg ON OrderItem.ProductPerKgID = ProductPerKg.ID WHERE RestaurantOrder.ID = ?;
-            """, (order_id,))
-            for row in cursor:
-                item_per_kg = {
-                    "Weight": row[0],
-                    "PricePerKg": row[1],
-                    "Total": row[2],
-                    "Category": row[3],
-                    "ProductPerKgID": row[4]
-                }
-                items_per_kg.append(item_per_kg)
-            return items, items_per_kg
+            total = rows[0][11]
+            for row in rows:
+                if row[0] is not None:
+                    items.append({
+                        "Name": row[2],
+                        "Category": row[3],
+                        "Price": row[4],
+                        "Quantity": row[1],
+                        "ProductID": row[0]
+                    })
+                elif row[6] is not None:
+                    items_per_kg.append({
+                        "Weight": row[7],
+                        "PricePerKg": row[8],
+                        "Total": row[9],
+                        "Category": row[10],
+                        "ProductPerKgID": row[6]
+                    })
+            return True, items, items_per_kg, total
         except mariadb.Error as e:
-            print(f"Error fetching order item by ID: {e}")
+            logger.exception("Error fetching order items by order number: %s", e)
             return None
-        finally:
-            cursor.close()
 
-    def select_by_order_id(self, restaurant_order_id: int):
-        cursor = self.db.conn.cursor()
+    def select_by_order_id(self, restaurant_order_id: int) -> list[OrderItem]:
+        cursor = self.db.prepared_cursor(_SELECT_BY_ORDER_ID)
         try:
-            cursor.execute("""
-                SELECT ID, RestaurantOrderID, ProductID, ProductPerKgID, Quantity
-                FROM `OrderItem`
-                WHERE RestaurantOrderID = ?
-            """, (restaurant_order_id,))
-            for row in cursor:
-                yield OrderItem(
-                    id=row[0],
-                    restaurant_order_id=row[1],
-                    product_id=row[2],
-                    product_per_kg_id=row[3],
-                    quantity=row[4]
-                )
+            cursor.execute(_SELECT_BY_ORDER_ID, (restaurant_order_id,))
+            # eager: the shared prepared cursor may be executed again while the caller iterates
+            return [OrderItem.from_row(row) for row in cursor.fetchall()]
         except mariadb.Error as e:
-            print(f"Error fetching order items by order ID: {e}")
-        finally:
-            cursor.close()
+            logger.exception("Error fetching order items by order ID: %s", e)
+            return []
 
     def delete_by_id(self, order_item_id: int) -> bool:
-        cursor = self.db.conn.cursor()
+        cursor = self.db.prepared_cursor(_DELETE_BY_ID)
         try:
-            cursor.execute("DELETE FROM `OrderItem` WHERE ID = ?", (order_item_id,))
-            self.db.conn.commit()
+            cursor.execute(_DELETE_BY_ID, (order_item_id,))
+            self.db.commit()
             return True
         except mariadb.Error as e:
-            print(f"Error deleting order item by ID: {e}")
-            self.db.conn.rollback()
+            logger.exception("Error deleting order item by ID: %s", e)
+            self.db.rollback()
             return False
-        finally:
-            cursor.close()
 
     def update(self, order_item: OrderItem) -> bool:
-        cursor = self.db.conn.cursor()
+        cursor = self.db.prepared_cursor(_UPDATE)
         try:
-            cursor.execute("""
-                UPDATE `OrderItem` 
-                SET RestaurantOrderID = ?, ProductID = ?, ProductPerKgID = ?, Quantity = ?
-                WHERE ID = ?
-            """, (order_item.restaurant_order_id,
-                  order_item.product_id,
-                  order_item.product_per_kg_id,
-                  order_item.quantity,
-                  order_item.id))
-            self.db.conn.commit()
+            cursor.execute(_UPDATE, (order_item.restaurant_order_id,
+                                     order_item.product_id,
+                                     order_item.product_per_kg_id,
+                                     order_item.quantity,
+                                     order_item.id))
+            self.db.commit()
             return True
         except mariadb.Error as e:
-            print(f"Error updating order item: {e}")
-            self.db.conn.rollback()
+            logger.exception("Error updating order item: %s", e)
+            self.db.rollback()
             return False
-        finally:
-            cursor.close()
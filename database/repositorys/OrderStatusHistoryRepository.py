@@ -6,10 +6,14 @@ methods for performing CRUD operations on order status history records.
 It supports inserting, updating, deleting, and retrieving order status changes
 for specific restaurant orders.
 """
+import logging
+
 import mariadb
 
 from database import OrderStatusHistory, OrderStatus
 
+logger = logging.getLogger(__name__)
+
 
 class OrderStatusHistoryRepository:
     """
@@ -39,11 +43,11 @@ class OrderStatusHistoryRepository:
                   history.change_time, history.note))
 
             history.id = cursor.lastrowid
-            self.db.conn.commit()
+            self.db.commit()
             return True
         except mariadb.Error as e:
-            print(f"Error inserting order status history: {e}")
-            self.db.conn.rollback()
+            logger.exception("Error inserting order status history: %s", e)
+            self.db.rollback()
             return False
         finally:
             cursor.close()
@@ -62,13 +66,13 @@ class OrderStatusHistoryRepository:
                 return OrderStatusHistory(
                     id=row[0],
                     restaurant_order_id=row[1],
-                    status=OrderStatus(row[2]),
+                    status=OrderStatus.from_db(row[2]),
                     change_time=row[3],
                     note=row[4]
                 )
             return None
         except mariadb.Error as e:
-            print(f"Error fetching order status history by ID: {e}")
+            logger.exception("Error fetching order status history by ID: %s", e)
             return None
         finally:
             cursor.close()
@@ -85,12 +89,12 @@ class OrderStatusHistoryRepository:
                 yield OrderStatusHistory(
                     id=row[0],
                     restaurant_order_id=row[1],
-                    status=OrderStatus(row[2]),
+                    status=OrderStatus.from_db(row[2]),
                     change_time=row[3],
                     note=row[4]
                 )
         except mariadb.Error as e:
-            print(f"Error fetching status history by order ID: {e}")
+            logger.exception("Error fetching status history by order ID: %s", e)
         finally:
             cursor.close()
 
@@ -98,11 +102,11 @@ class OrderStatusHistoryRepository:
         cursor = self.db.conn.cursor()
         try:
             cursor.execute("DELETE FROM `OrderStatusHistory` WHERE ID = ?", (history_id,))
-            self.db.conn.commit()
+            self.db.commit()
             return True
         except mariadb.Error as e:
-            print(f"Error deleting order status history by ID: {e}")
-            self.db.conn.rollback()
+            logger.exception("Error deleting order status history by ID: %s", e)
+            self.db.rollback()
             return False
         finally:
             cursor.close()
@@ -114,11 +118,11 @@ class OrderStatusHistoryRepository:
                 UPDATE `OrderStatusHistory` SET RestaurantOrder_ID = ?, Status = ?, Change_Time = ?, Note = ?
                 WHERE ID = ?
             """, (history.restaurant_order_id, history.status.value, history.change_time, history.note, history.id))
-            self.db.conn.commit()
+            self.db.commit()
             return True
         except mariadb.Error as e:
-            print(f"Error updating order status history: {e}")
-            self.db.conn.rollback()
+            logger.exception("Error updating order status history: %s", e)
+            self.db.rollback()
             return False
         finally:
             cursor.close()
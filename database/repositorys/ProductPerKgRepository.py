@@ -6,10 +6,14 @@ methods for performing CRUD operations on products sold by weight.
 It supports inserting, updating, deleting, and retrieving product
 details from the database, including paginated retrieval of products.
 """
+import logging
+
 import mariadb
 
 from database import ProductPerKg
 
+logger = logging.getLogger(__name__)
+
 
 class ProductPerKgRepository:
     """
@@ -22,8 +26,9 @@ class ProductPerKgRepository:
             insert(product_per_kg: ProductPerKg) -> bool: Inserts a new product per kg into the database.
             select_by_id(product_per_kg_id: int) -> ProductPerKg | None: Retrieves a product per kg by its ID.
             select_all() -> Generator[ProductPerKg, None, None]: Yields all products per kg in the database.
-            select_all_paged(limit: int, offset: int) -> Generator[ProductPerKg, None, None]:
-                Yields products per kg with pagination.
+            select_all_after(cursor_id: int | None, limit: int) -> Generator[ProductPerKg, None, None]:
+                Yields products per kg with an ID greater than the cursor (keyset pagination), raising on a
+                database error.
             delete_by_id(product_per_kg_id: int) -> (bool, int): Deletes a product per kg by its ID.
             update(product_per_kg: ProductPerKg) -> bool: Updates an existing product per kg in the database.
     """
@@ -36,15 +41,18 @@ class ProductPerKgRepository:
             cursor.execute("""
                 INSERT INTO `ProductPerKg` (Description, Weight, PricePerKg, Category)
                 VALUES (?, ?, ?, ?)
+                RETURNING ID, Total
             """, (product_per_kg.description, product_per_kg.weight,
                   product_per_kg.price_per_kg, product_per_kg.category))
 
-            product_per_kg.id = cursor.lastrowid
-            self.db.conn.commit()
+            # the stored total is rounded to the column's two decimals, keep the value the database will report
+            product_per_kg.id, total = cursor.fetchone()
+            product_per_kg.total = float(total)
+            self.db.commit()
             return True
         except mariadb.Error as e:
-            print(f"Error inserting product per kg: {e}")
-            self.db.conn.rollback()
+            logger.exception("Error inserting product per kg: %s", e)
+            self.db.rollback()
             return False
         finally:
             cursor.close()
@@ -53,23 +61,17 @@ class ProductPerKgRepository:
         cursor = self.db.conn.cursor()
         try:
             cursor.execute("""
-                SELECT ID, Description, Weight, PricePerKg, Category, Total
+                SELECT Weight, PricePerKg, ID, Description, Category, Total
                 FROM `ProductPerKg`
                 WHERE ID = ?
             """, (product_per_kg_id,))
             row = cursor.fetchone()
 
             if row:
-                return ProductPerKg(
-                    id=row[0],
-                    description=row[1],
-                    weight=row[2],
-                    price_per_kg=row[3],
-                    category=row[4]
-                )
+                return ProductPerKg.from_row(row)
             return None
         except mariadb.Error as e:
-            print(f"Error fetching product per kg by ID: {e}")
+            logger.exception("Error fetching product per kg by ID: %s", e)
             return None
         finally:
             cursor.close()
@@ -78,39 +80,33 @@ class ProductPerKgRepository:
         cursor = self.db.conn.cursor()
         try:
             cursor.execute("""
-                SELECT ID, Description, Weight, PricePerKg, Category, Total
+                SELECT Weight, PricePerKg, ID, Description, Category, Total
                 FROM `ProductPerKg`
             """)
-            for row in cursor:
-                yield ProductPerKg(
-                    id=row[0],
-                    description=row[1],
-                    weight=row[2],
-                    price_per_kg=row[3],
-                    category=row[4]
-                )
+            while batch := cursor.fetchmany(1024):
+                for row in batch:
+                    yield ProductPerKg.from_row(row)
         except mariadb.Error as e:
-            print(f"Error fetching all products per kg: {e}")
+            logger.exception("Error fetching all products per kg: %s", e)
         finally:
             cursor.close()
 
-    def select_all_paged(self, limit: int, offset: int):
-        cursor = self.db.conn.cursor()
+    def select_all_after(self, cursor_id: int | None, limit: int):
+        # unbuffered: the page is streamed to the client row by row as the server sends it, without first
+        # copying it into the client; nothing else may run on the connection until the generator is done
+        cursor = self.db.read_conn.cursor(buffered=False)
         try:
+            # keyset pagination on the primary key, the cost does not grow with the page depth
             cursor.execute("""
-                SELECT ID, Description, Weight, PricePerKg, Category, Total
-                FROM `ProductPerKg` LIMIT ? OFFSET ?
-            """, (limit, offset))
+                SELECT Weight, PricePerKg, ID, Description, Category, Total
+                FROM `ProductPerKg` WHERE ID > ? ORDER BY ID LIMIT ?
+            """, (cursor_id or 0, limit))
             for row in cursor:
-                yield ProductPerKg(
-                    id=row[0],
-                    description=row[1],
-                    weight=row[2],
-                    price_per_kg=row[3],
-                    category=row[4]
-                )
+                yield ProductPerKg.from_row(row)
         except mariadb.Error as e:
-            print(f"Error fetching all products per kg: {e}")
+            # the rows are already being streamed, ending quietly would pass a cut page off as the last one
+            logger.exception("Error fetching products per kg: %s", e)
+            raise
         finally:
             cursor.close()
 
@@ -118,11 +114,11 @@ class ProductPerKgRepository:
         cursor = self.db.conn.cursor()
         try:
             cursor.execute("DELETE FROM `ProductPerKg` WHERE ID = ?", (product_per_kg_id,))
-            self.db.conn.commit()
+            self.db.commit()
             return True, cursor.rowcount
         except mariadb.Error as e:
-            print(f"Error deleting product per kg by ID: {e}")
-            self.db.conn.rollback()
+            logger.exception("Error deleting product per kg by ID: %s", e)
+            self.db.rollback()
             return False, 0
         finally:
             cursor.close()
@@ -135,11 +131,11 @@ class ProductPerKgRepository:
                 WHERE ID = ?
             """, (product_per_kg.description, product_per_kg.weight,
                   product_per_kg.price_per_kg, product_per_kg.category, product_per_kg.id))
-            self.db.conn.commit()
+            self.db.commit()
             return True
         except mariadb.Error as e:
-            print(f"Error updating product per kg: {e}")
-            self.db.conn.rollback()
+            logger.exception("Error updating product per kg: %s", e)
+            self.db.rollback()
             return False
         finally:
             cursor.close()
@@ -9,10 +9,14 @@ Dependencies:
     mariadb: MariaDB connector for Python.
     database: Imports the Product class for product management.
 """
+import logging
+
 import mariadb
 
 from database import Product
 
+logger = logging.getLogger(__name__)
+
 
 class ProductRepository:
     """
@@ -22,7 +26,8 @@ class ProductRepository:
             insert(product: Product) -> bool: Inserts a new product into the database.
             select_by_id(product_id: int) -> Product | None: Retrieves a product by its ID.
             select_all() -> Generator[Product]: Yields all products from the database.
-            select_all_paged(limit: int, offset: int) -> Generator[Product]: Yields products with pagination support.
+            select_all_after(cursor_id: int | None, limit: int) -> Generator[Product]:
+                Yields products with an ID greater than the cursor (keyset pagination), raising on a database error.
             delete_by_id(product_id: int) -> (bool, int): Deletes a product by its ID and returns success status and affected row count.
             update(product: Product) -> bool: Updates an existing product's details in the database.
             get_product_summary() -> tuple: Retrieves a summary of the products in the database,
@@ -42,11 +47,11 @@ class ProductRepository:
                   product.category, product.stock, product.active))
 
             product.id = cursor.lastrowid
-            self.db.conn.commit()
+            self.db.commit()
             return True
         except mariadb.Error as e:
-            print(f"Error inserting product: {e}")
-            self.db.conn.rollback()
+            logger.exception("Error inserting product: %s", e)
+            self.db.rollback()
             return False
         finally:
             cursor.close()
@@ -73,7 +78,7 @@ class ProductRepository:
                 )
             return None
         except mariadb.Error as e:
-            print(f"Error fetching product by ID: {e}")
+            logger.exception("Error fetching product by ID: %s", e)
             return None
         finally:
             cursor.close()
@@ -82,31 +87,28 @@ class ProductRepository:
         cursor = self.db.conn.cursor()
         try:
             cursor.execute("""
-                SELECT ID, Name, Description, Price, Category, Stock, Active
+                SELECT Name, Price, Stock, ID, Description, Category, Active
                 FROM `Product`
             """)
-            for row in cursor:
-                yield Product(
-                    id=row[0],
-                    name=row[1],
-                    description=row[2],
-                    price=row[3],
-                    category=row[4],
-                    stock=row[5],
-                    active=row[6]
-                )
+            # rows come in the dataclass field order, so they are built positionally in batches
+            while batch := cursor.fetchmany(1024):
+                for row in batch:
+                    yield Product(*row)
         except mariadb.Error as e:
-            print(f"Error fetching all products: {e}")
+            logger.exception("Error fetching all products: %s", e)
         finally:
             cursor.close()
 
-    def select_all_paged(self, limit: int, offset: int):
-        cursor = self.db.conn.cursor()
+    def select_all_after(self, cursor_id: int | None, limit: int):
+        # unbuffered: the page is streamed to the client row by row as the server sends it, without first
+        # copying it into the client; nothing else may run on the connection until the generator is done
+        cursor = self.db.read_conn.cursor(buffered=False)
         try:
+            # keyset pagination on the primary key, the cost does not grow with the page depth
             cursor.execute("""
                 SELECT ID, Name, Description, Price, Category, Stock, Active
-                FROM `Product` LIMIT ? OFFSET ?
-            """, (limit, offset))
+                FROM `Product` WHERE ID > ? ORDER BY ID LIMIT ?
+            """, (cursor_id or 0, limit))
             for row in cursor:
                 yield Product(
                     id=row[0],
@@ -118,7 +120,9 @@ class ProductRepository:
                     active=row[6]
                 )
         except mariadb.Error as e:
-            print(f"Error fetching all products: {e}")
+            # the rows are already being streamed, ending quietly would pass a cut page off as the last one
+            logger.exception("Error fetching products: %s", e)
+            raise
         finally:
             cursor.close()
 
@@ -126,11 +130,11 @@ class ProductRepository:
         cursor = self.db.conn.cursor()
         try:
             cursor.execute("DELETE FROM `Product` WHERE ID = ?", (product_id,))
-            self.db.conn.commit()
+            self.db.commit()
             return True, cursor.rowcount
         except mariadb.Error as e:
-            print(f"Error deleting product by ID: {e}")
-            self.db.conn.rollback()
+            logger.exception("Error deleting product by ID: %s", e)
+            self.db.rollback()
             return False, 0
         finally:
             cursor.close()
@@ -143,11 +147,11 @@ class ProductRepository:
                 WHERE ID = ?
             """, (product.name, product.description, product.price,
                   product.category, product.stock, product.active, product.id))
-            self.db.conn.commit()
+            self.db.commit()
             return True
         except mariadb.Error as e:
-            print(f"Error updating product: {e}")
-            self.db.conn.rollback()
+            logger.exception("Error updating product: %s", e)
+            self.db.rollback()
             return False
         finally:
             cursor.close()
@@ -166,6 +170,6 @@ class ProductRepository:
                 return total_value, total_count
             return 0, 0
         except mariadb.Error as e:
-            print(f"Error fetching product summary: {e}")
+            logger.exception("Error fetching product summary: %s", e)
         finally:
             cursor.close()
\ No newline at end of file
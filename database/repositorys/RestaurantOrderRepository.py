@@ -7,10 +7,20 @@ the database. It also includes functionality for calculating total amounts
 for orders and checking the existence of open orders by their number.
 """
 import datetime
+import logging
 
 import mariadb
+from mariadb.constants import ERR
 
-from database import RestaurantOrder
+from database import RestaurantOrder, PaymentMethod, CheckinStatus
+
+logger = logging.getLogger(__name__)
+
+_SELECT_OPEN_BY_NUMBER = """
+    SELECT ID, Number, Entry_Time, Exit_Time, Status, Note, Payment_Method, Total_Amount, Paid
+    FROM RestaurantOrder
+    WHERE Number = ? AND Status = 'Open'
+"""
 
 
 class RestaurantOrderRepository:
@@ -22,19 +32,31 @@ class RestaurantOrderRepository:
 
         Methods:
             insert(order: RestaurantOrder) -> bool: Inserts a new order into the database.
+            insert_with_history(order: RestaurantOrder, note: str) -> CheckinStatus:
+                Inserts a new order and its first status history entry in a single transaction, relying on the
+                unique open number index to reject a number that is already open.
             select_by_id(order_id: int) -> RestaurantOrder | None: Retrieves an order by its ID.
             select_by_number_open(number: int) -> RestaurantOrder | None: Retrieves an open order by its number.
+            select_open_with_total(number: int) -> tuple[RestaurantOrder | None, float] | None:
+                Retrieves an open order by its number together with its current total.
             select_all() -> Generator[RestaurantOrder, None, None]: Yields all orders in the database.
-            select_all_open_paged(limit: int, offset: int) -> Generator[RestaurantOrder, None, None]:
-                Yields open orders with pagination.
-            select_all_close_paged(limit: int, offset: int) -> Generator[RestaurantOrder, None, None]:
-                Yields closed orders with pagination.
+            select_all_open_before(cursor_id: int | None, limit: int) -> Generator[RestaurantOrder, None, None]:
+                Yields open orders with an ID lower than the cursor, newest first (keyset pagination).
+            select_all_close_before(cursor_id: int | None, limit: int) -> Generator[RestaurantOrder, None, None]:
+                Yields closed orders with an ID lower than the cursor, newest first (keyset pagination).
+                Both raise on a database error.
             delete_by_id(order_id: int) -> bool: Deletes an order by its ID.
             update(order: RestaurantOrder) -> bool: Updates an existing order in the database.
+            close_order(number: int, payment_method: PaymentMethod, note: str | None, exit_time: datetime.datetime)
+                -> tuple[bool, Decimal, int | None] | None: Locks the open order, closes it and returns its total
+                and ID.
             exists_number_open(number: int) -> bool: Checks if an open order exists by its number.
-            calc_total(order_id: int) -> float | None: Calculates the total amount for a specific order.
-            get_payment_summary(entry_date: datetime.datetime, exit_date: datetime.datetime) -> dict
-                create a summary of payment methods
+            calc_total(order_id: int) -> float | None: Returns the total amount for a specific order,
+                kept up to date by the OrderItem and product price triggers.
+            get_payment_summary(days: int | None) -> list[dict] | None: create a summary of payment methods
+                for the paid orders of the last `days` days, or of all time when `days` is None
+            get_order_stats(days: int | None) -> dict | None: aggregates the totals and durations of the paid
+                orders of the last `days` days, or of all time when `days` is None
     """
     def __init__(self, db):
         self.db = db
@@ -50,15 +72,50 @@ class RestaurantOrderRepository:
                   order.total_amount, order.paid))
 
             order.id = cursor.lastrowid
-            self.db.conn.commit()
+            self.db.commit()
             return True
         except mariadb.Error as e:
-            print(f"Error inserting order: {e}")
-            self.db.conn.rollback()
+            logger.exception("Error inserting order: %s", e)
+            self.db.rollback()
             return False
         finally:
             cursor.close()
 
+    def insert_with_history(self, order: RestaurantOrder, note: str = "Created") -> CheckinStatus:
+        cursor = self.db.conn.cursor()
+        try:
+            cursor.execute("""
+                INSERT INTO RestaurantOrder (Number, Entry_Time, Exit_Time, Status, Note, Payment_Method, Total_Amount, Paid)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            """, (order.number, order.entry_time, order.exit_time, order.status.value,
+                  order.note, order.payment_method.value if order.payment_method else None,
+                  order.total_amount, order.paid))
+            order.id = cursor.lastrowid
+
+            # LAST_INSERT_ID() is resolved by the server, so the order ID never travels back before this insert
+            cursor.execute("""
+                INSERT INTO `OrderStatusHistory` (RestaurantOrder_ID, Status, Change_Time, Note)
+                VALUES (LAST_INSERT_ID(), ?, ?, ?)
+            """, (order.status.value, order.entry_time, note))
+
+            self.db.commit()
+            return CheckinStatus.CREATED
+        except mariadb.IntegrityError as e:
+            self.db.rollback()
+            order.id = None
+            # uq_open_number: another open order already uses this number; any other constraint is a real failure
+            if e.errno == ERR.ER_DUP_ENTRY and "uq_open_number" in str(e):
+                return CheckinStatus.NUMBER_IN_USE
+            logger.exception("Error inserting order with history: %s", e)
+            return CheckinStatus.ERROR
+        except mariadb.Error as e:
+            logger.exception("Error inserting order with history: %s", e)
+            self.db.rollback()
+            order.id = None
+            return CheckinStatus.ERROR
+        finally:
+            cursor.close()
+
     def select_by_id(self, order_id: int) -> RestaurantOrder | None:
         cursor = self.db.conn.cursor()
         try:
@@ -83,7 +140,7 @@ class RestaurantOrderRepository:
                 )
             return None
         except mariadb.Error as e:
-            print(f"Error fetching order by ID: {e}")
+            logger.exception("Error fetching order by ID: %s", e)
             return None
         finally:
             cursor.close()
@@ -112,20 +169,20 @@ class RestaurantOrderRepository:
                 )
             return None
         except mariadb.Error as e:
-            print(f"Error fetching order by ID: {e}")
+            logger.exception("Error fetching order by ID: %s", e)
             return None
         finally:
             cursor.close()
 
-    def select_all(self):
-        cursor = self.db.conn.cursor()
+    def select_open_with_total(self, number: int) -> tuple | None:
+        # hot point lookup, the cursor stays prepared on the connection and is not closed
+        cursor = self.db.prepared_cursor(_SELECT_OPEN_BY_NUMBER)
         try:
-            cursor.execute("""
-                SELECT ID, Number, Entry_Time, Exit_Time, Status, Note, Payment_Method, Total_Amount, Paid
-                FROM RestaurantOrder
-            """)
-            for row in cursor:
-                yield RestaurantOrder(
+            cursor.execute(_SELECT_OPEN_BY_NUMBER, (number,))
+            row = cursor.fetchone()
+
+            if row:
+                return RestaurantOrder(
                     id=row[0],
                     number=row[1],
                     entry_time=row[2],
@@ -135,43 +192,50 @@ class RestaurantOrderRepository:
                     payment_method=row[6],
                     total_amount=row[7],
                     paid=row[8]
-                )
+                ), row[7]
+            return None, 0
         except mariadb.Error as e:
-            print(f"Error fetching all orders: {e}")
-        finally:
-            cursor.close()
+            logger.exception("Error fetching order with total: %s", e)
+            return None
 
-    def select_all_open_paged(self, limit: int, offset: int):
+    def select_all(self):
         cursor = self.db.conn.cursor()
         try:
             cursor.execute("""
-                SELECT ID, Number, Entry_Time, Exit_Time, Status, Note, Payment_Method, Total_Amount, Paid
-                FROM RestaurantOrder WHERE Status = 'Open' LIMIT ? OFFSET ?
-            """, (limit, offset))
-            for row in cursor:
-                yield RestaurantOrder(
-                    id=row[0],
-                    number=row[1],
-                    entry_time=row[2],
-                    exit_time=row[3],
-                    status=row[4],
-                    note=row[5],
-                    payment_method=row[6],
-                    total_amount=row[7],
-                    paid=row[8]
-                )
+                SELECT Number, Entry_Time, ID, Exit_Time, Status, Note, Payment_Method, Total_Amount, Paid
+                FROM RestaurantOrder
+            """)
+            # rows come in the dataclass field order, so they are built positionally in batches
+            while batch := cursor.fetchmany(1024):
+                for row in batch:
+                    yield RestaurantOrder(*row)
         except mariadb.Error as e:
-            print(f"Error fetching all orders: {e}")
+            logger.exception("Error fetching all orders: %s", e)
         finally:
             cursor.close()
 
-    def select_all_close_paged(self, limit: int, offset: int):
-        cursor = self.db.conn.cursor()
+    def select_all_open_before(self, cursor_id: int | None, limit: int):
+        return self.__select_by_status_before('Open', cursor_id, limit)
+
+    def select_all_close_before(self, cursor_id: int | None, limit: int):
+        return self.__select_by_status_before('Closed', cursor_id, limit)
+
+    # Keyset pagination over (Status, ID): seeks straight to the cursor instead of scanning OFFSET rows
+    def __select_by_status_before(self, status: str, cursor_id: int | None, limit: int):
+        # unbuffered: the page is streamed to the client row by row as the server sends it, without first
+        # copying it into the client; nothing else may run on the connection until the generator is done
+        cursor = self.db.read_conn.cursor(buffered=False)
         try:
-            cursor.execute("""
-                SELECT ID, Number, Entry_Time, Exit_Time, Status, Note, Payment_Method, Total_Amount, Paid
-                FROM RestaurantOrder WHERE Status = 'Closed' LIMIT ? OFFSET ?
-            """, (limit, offset))
+            if cursor_id is None:
+                cursor.execute("""
+                    SELECT ID, Number, Entry_Time, Exit_Time, Status, Note, Payment_Method, Total_Amount, Paid
+                    FROM RestaurantOrder WHERE Status = ? ORDER BY ID DESC LIMIT ?
+                """, (status, limit))
+            else:
+                cursor.execute("""
+                    SELECT ID, Number, Entry_Time, Exit_Time, Status, Note, Payment_Method, Total_Amount, Paid
+                    FROM RestaurantOrder WHERE Status = ? AND ID < ? ORDER BY ID DESC LIMIT ?
+                """, (status, cursor_id, limit))
             for row in cursor:
                 yield RestaurantOrder(
                     id=row[0],
@@ -185,7 +249,9 @@ class RestaurantOrderRepository:
                     paid=row[8]
                 )
         except mariadb.Error as e:
-            print(f"Error fetching all orders: {e}")
+            # the rows are already being streamed, ending quietly would pass a cut page off as the last one
+            logger.exception("Error fetching orders by status: %s", e)
+            raise
         finally:
             cursor.close()
 
@@ -193,11 +259,11 @@ class RestaurantOrderRepository:
         cursor = self.db.conn.cursor()
         try:
             cursor.execute("DELETE FROM RestaurantOrder WHERE ID = ?", (order_id,))
-            self.db.conn.commit()
+            self.db.commit()
             return True
         except mariadb.Error as e:
-            print(f"Error delete order by ID: {e}")
-            self.db.conn.rollback()
+            logger.exception("Error delete order by ID: %s", e)
+            self.db.rollback()
             return False
         finally:
             cursor.close()
@@ -211,25 +277,57 @@ class RestaurantOrderRepository:
             """, (order.number, order.entry_time, order.exit_time, order.status.value,
                   order.note, order.payment_method.value if order.payment_method else None,
                   order.total_amount, order.paid, order.id))
-            self.db.conn.commit()
+            self.db.commit()
             return True
         except mariadb.Error as e:
-            print(f"Error updating order: {e}")
-            self.db.conn.rollback()
+            logger.exception("Error updating order: %s", e)
+            self.db.rollback()
             return False
         finally:
             cursor.close()
 
-    def exists_number_open(self, number: int):
+    def close_order(self, number: int, payment_method: PaymentMethod, note: str | None,
+                    exit_time: datetime.datetime) -> tuple | None:
         cursor = self.db.conn.cursor()
         try:
+            # the row lock keeps items from being added, and the total from changing, until the order is closed
             cursor.execute("""
-                        SELECT EXISTS (SELECT 1 FROM RestaurantOrder WHERE Number = ? AND Status = 'Open')
-                    """, (number,))
+                SELECT ID, Total_Amount FROM RestaurantOrder
+                WHERE Number = ? AND Status = 'Open'
+                FOR UPDATE
+            """, (number,))
             row = cursor.fetchone()
-            return bool(row[0])
+            if row is None:
+                self.db.rollback()
+                return False, 0, None
+
+            order_id, total = row
+            cursor.execute("""
+                UPDATE RestaurantOrder
+                SET Status = 'Closed', Exit_Time = ?, Paid = TRUE, Payment_Method = ?, Note = COALESCE(?, Note)
+                WHERE ID = ?
+            """, (exit_time, payment_method.value, note, order_id))
+            self.db.commit()
+            return True, total, order_id
+        except mariadb.Error as e:
+            logger.exception("Error closing order: %s", e)
+            self.db.rollback()
+            return None
+        finally:
+            cursor.close()
+
+    def exists_number_open(self, number: int):
+        cursor = self.db.conn.cursor()
+        try:
+            cursor.execute("""
+                SELECT 1
+                FROM RestaurantOrder
+                WHERE Number = ? AND Status = 'Open'
+                LIMIT 1
+            """, (number,))
+            return cursor.fetchone() is not None
         except mariadb.Error as e:
-            print(f"Error on checking if number open exist: {e}")
+            logger.exception("Error on checking if number open exist: %s", e)
             return False
         finally:
             cursor.close()
@@ -237,36 +335,31 @@ class RestaurantOrderRepository:
     def calc_total(self, order_id: int):
         cursor = self.db.conn.cursor()
         try:
-            cursor.execute("""
-                        SELECT 
-                            (SELECT SUM(OrderItem.Quantity * Product.Price) 
-                             FROM OrderItem 
-                             INNER JOIN RestaurantOrder ON RestaurantOrder.ID = OrderItem.RestaurantOrderID 
-                             INNER JOIN Product ON OrderItem.ProductID = Product.ID 
-                             WHERE RestaurantOrder.ID = ?) 
-                            +
-                            (SELECT SUM(OrderItem.Quantity * ProductPerKg.PricePerKg * ProductPerKg.Weight) 
-                             FROM OrderItem 
-                             INNER JOIN RestaurantOrder ON RestaurantOrder.ID = OrderItem.RestaurantOrderID 
-                             INNER JOIN ProductPerKg ON OrderItem.ProductPerKgID = ProductPerKg.ID 
-                             WHERE RestaurantOrder.ID = ?) 
-                        AS Total;
-                    """, (order_id, order_id))
+            cursor.execute("SELECT Total_Amount FROM RestaurantOrder WHERE ID = ?", (order_id,))
             row = cursor.fetchone()
 
             if row:
                 return row[0] if row[0] is not None else 0
             return None
         except mariadb.Error as e:
-            print(f"Error fetching order by ID: {e}")
+            logger.exception("Error fetching order by ID: %s", e)
             return None
         finally:
             cursor.close()
 
-    def get_payment_summary(self, entry_date: datetime.datetime, exit_date: datetime.datetime):
-        cursor = self.db.conn.cursor()
+    # The window is computed by the server; Entry_Time is stored in UTC, so it is compared against UTC_TIMESTAMP().
+    # The lifetime statistics have no lower bound at all instead of an arbitrary old date
+    @staticmethod
+    def __entry_window(days: int | None) -> tuple[str, tuple]:
+        if days is None:
+            return "", ()
+        return "AND Entry_Time >= UTC_TIMESTAMP() - INTERVAL ? DAY", (days,)
+
+    def get_payment_summary(self, days: int | None):
+        window, params = self.__entry_window(days)
+        cursor = self.db.read_conn.cursor()
         try:
-            cursor.execute("""
+            cursor.execute(f"""
                 SELECT
                     Payment_Method,
                     COUNT(*) AS Count,
@@ -275,11 +368,11 @@ class RestaurantOrderRepository:
                     RestaurantOrder
                 WHERE
                     Paid = 1
-                    AND Entry_Time BETWEEN ? AND ?
+                    {window}
                     AND Payment_Method IN ('Pix', 'Card', 'Cash', 'Others')
                 GROUP BY
                     Payment_Method;
-            """, (entry_date, exit_date))
+            """, params)
             rows = cursor.fetchall()
 
             if rows:
@@ -292,15 +385,16 @@ class RestaurantOrderRepository:
                     ]
             return None
         except mariadb.Error as e:
-            print(f"Error fetching payment summary: {e}")
+            logger.exception("Error fetching payment summary: %s", e)
             return None
         finally:
             cursor.close()
 
-    def get_order_stats(self, entry_date: datetime.datetime, exit_date: datetime.datetime):
-        cursor = self.db.conn.cursor()
+    def get_order_stats(self, days: int | None):
+        window, params = self.__entry_window(days)
+        cursor = self.db.read_conn.cursor()
         try:
-            cursor.execute("""
+            cursor.execute(f"""
                 SELECT
                     SUM(Total_Amount) AS Total_Sum,
                     AVG(Total_Amount) AS Average_Amount,
@@ -314,8 +408,8 @@ class RestaurantOrderRepository:
                     RestaurantOrder
                 WHERE
                     Paid = 1
-                    AND Entry_Time BETWEEN ? AND ?;
-            """, (entry_date, exit_date))
+                    {window};
+            """, params)
             row = cursor.fetchone()
 
             if row:
@@ -331,7 +425,7 @@ class RestaurantOrderRepository:
                 }
             return None
         except mariadb.Error as e:
-            print(f"Error fetching order statistics: {e}")
+            logger.exception("Error fetching order statistics: %s", e)
             return None
         finally:
             cursor.close()
\ No newline at end of file
@@ -9,10 +9,22 @@ Dependencies:
     mariadb: MariaDB connector for Python.
     database: Imports User and UserRole classes for user management.
 """
+import logging
+import threading
+
 import mariadb
+from cachetools import TTLCache
 
 from database import User, UserRole
 
+logger = logging.getLogger(__name__)
+
+_SELECT_BY_USERNAME = """
+    SELECT ID, Name, Username, Email, PasswordHash, Role, Active
+    FROM `User`
+    WHERE Username = ?
+"""
+
 
 class UserRepository:
     """Repository for managing user data in the database.
@@ -28,13 +40,27 @@ class UserRepository:
             select_by_id(user_id: int) -> User | None: Retrieves a user by their ID.
             select_by_username(username: str) -> User | None: Retrieves a user by their username.
             select_all() -> Generator[User, None, None]: Retrieves all users from the database.
+            exists_any() -> bool: Checks if at least one user exists.
+            select_all_public_fields() -> list[dict]: Retrieves name, username, email, role and active of all users.
             delete_by_id(user_id: int) -> bool: Deletes a user by their ID.
             update(user: User) -> bool: Updates an existing user's information.
             user_name_exists(username: str) -> bool: Checks if a username already exists.
             email_exists(email: str) -> bool: Checks if an email already exists.
+            check_conflicts(username: str, email: str) -> tuple[bool, bool]:
+                Checks in a single query whether the username and the email are already taken.
+
+        `email_exists` remembers the taken emails for 30 seconds, a taken email rarely becomes free again.
+        `update` and `delete_by_id` clear them, changes made by other workers are only observed after the TTL
+        expires.
     """
     def __init__(self, db):
         self.db = db
+        self.__taken = TTLCache(maxsize=4096, ttl=30)
+        self.__taken_lock = threading.Lock()
+
+    def __forget_taken(self):
+        with self.__taken_lock:
+            self.__taken.clear()
 
     def insert(self, user: User) -> bool:
         cursor = self.db.conn.cursor()
@@ -46,11 +72,11 @@ class UserRepository:
                   user.role.value, user.active))
 
             user.id = cursor.lastrowid
-            self.db.conn.commit()
+            self.db.commit()
             return True
         except mariadb.Error as e:
-            print(f"Error inserting user: {e}")
-            self.db.conn.rollback()
+            logger.exception("Error inserting user: %s", e)
+            self.db.rollback()
             return False
         finally:
             cursor.close()
@@ -72,24 +98,21 @@ class UserRepository:
                     username=row[2],
                     email=row[3],
                     password_hash=row[4],
-                    role=UserRole[row[5].upper()],
+                    role=UserRole.from_db(row[5]),
                     active=row[6]
                 )
             return None
         except mariadb.Error as e:
-            print(f"Error fetching user by ID: {e}")
+            logger.exception("Error fetching user by ID: %s", e)
             return None
         finally:
             cursor.close()
 
     def select_by_username(self, username: str) -> User | None:
-        cursor = self.db.conn.cursor()
+        # runs on every authenticated request, the cursor stays prepared on the connection and is not closed
+        cursor = self.db.prepared_cursor(_SELECT_BY_USERNAME)
         try:
-            cursor.execute("""
-                SELECT ID, Name, Username, Email, PasswordHash, Role, Active
-                FROM `User`
-                WHERE Username = ?
-            """, (username,))
+            cursor.execute(_SELECT_BY_USERNAME, (username,))
             row = cursor.fetchone()
 
             if row:
@@ -99,35 +122,53 @@ class UserRepository:
                     username=row[2],
                     email=row[3],
                     password_hash=row[4],
-                    role=UserRole[row[5].upper()],
+                    role=UserRole.from_db(row[5]),
                     active=row[6]
                 )
             return None
         except mariadb.Error as e:
-            print(f"Error fetching user by Username: {e}")
+            logger.exception("Error fetching user by Username: %s", e)
             return None
+
+    def select_all(self):
+        cursor = self.db.conn.cursor()
+        try:
+            cursor.execute("""
+                SELECT Name, Username, Email, PasswordHash, ID, Role, Active
+                FROM `User`
+            """)
+            # rows come in the dataclass field order, so they are built positionally in batches
+            while batch := cursor.fetchmany(1024):
+                for row in batch:
+                    yield User(*row[:5], UserRole.from_db(row[5]), row[6])
+        except mariadb.Error as e:
+            logger.exception("Error fetching all users: %s", e)
         finally:
             cursor.close()
 
-    def select_all(self):
+    # the table is small, reading it in one go frees the cursor at once instead of holding it while the caller iterates
+    def exists_any(self) -> bool:
         cursor = self.db.conn.cursor()
+        try:
+            cursor.execute("SELECT 1 FROM `User` LIMIT 1")
+            return cursor.fetchone() is not None
+        except mariadb.Error as e:
+            logger.exception("Error checking if any user exists: %s", e)
+            return False
+        finally:
+            cursor.close()
+
+    def select_all_public_fields(self) -> list[dict]:
+        cursor = self.db.conn.cursor(dictionary=True)
         try:
             cursor.execute("""
-                SELECT ID, Name, Username, Email, PasswordHash, Role, Active
+                SELECT Name AS name, Username AS username, Email AS email, Role AS role, Active AS active
                 FROM `User`
             """)
-            for row in cursor:
-                yield User(
-                    id=row[0],
-                    name=row[1],
-                    username=row[2],
-                    email=row[3],
-                    password_hash=row[4],
-                    role=UserRole[row[5].upper()],
-                    active=row[6]
-                )
+            return cursor.fetchall()
         except mariadb.Error as e:
-            print(f"Error fetching all users: {e}")
+            logger.exception("Error fetching all users: %s", e)
+            return []
         finally:
             cursor.close()
 
@@ -135,11 +176,12 @@ class UserRepository:
         cursor = self.db.conn.cursor()
         try:
             cursor.execute("DELETE FROM `User` WHERE ID = ?", (user_id,))
-            self.db.conn.commit()
+            self.db.commit()
+            self.__forget_taken()
             return True
         except mariadb.Error as e:
-            print(f"Error deleting user by ID: {e}")
-            self.db.conn.rollback()
+            logger.exception("Error deleting user by ID: %s", e)
+            self.db.rollback()
             return False
         finally:
             cursor.close()
@@ -152,11 +194,12 @@ class UserRepository:
                 WHERE ID = ?
             """, (user.name, user.username, user.email, user.password_hash,
                   user.role.value, user.active, user.id))
-            self.db.conn.commit()
+            self.db.commit()
+            self.__forget_taken()
             return True
         except mariadb.Error as e:
-            print(f"Error updating user: {e}")
-            self.db.conn.rollback()
+            logger.exception("Error updating user: %s", e)
+            self.db.rollback()
             return False
         finally:
             cursor.close()
@@ -165,26 +208,54 @@ class UserRepository:
         cursor = self.db.conn.cursor()
         try:
             cursor.execute("""
-                        SELECT EXISTS (SELECT 1 FROM User WHERE Username = ?)
-                    """, (username,))
-            row = cursor.fetchone()
-            return bool(row[0])
+                SELECT 1
+                FROM `User`
+                WHERE Username = ?
+                LIMIT 1
+            """, (username,))
+            return cursor.fetchone() is not None
         except mariadb.Error as e:
-            print(f"Error on checking if username exist: {e}")
+            logger.exception("Error on checking if username exist: %s", e)
             return False
         finally:
             cursor.close()
 
     def email_exists(self, email: str) -> bool:
+        # only taken emails are cached, so an email registered in this process is seen at once
+        with self.__taken_lock:
+            if email in self.__taken:
+                return True
+
         cursor = self.db.conn.cursor()
         try:
             cursor.execute("""
-                        SELECT EXISTS (SELECT 1 FROM User WHERE Email = ?)
-                    """, (email,))
-            row = cursor.fetchone()
-            return bool(row[0])
+                SELECT 1
+                FROM `User`
+                WHERE Email = ?
+                LIMIT 1
+            """, (email,))
+            taken = cursor.fetchone() is not None
+            if taken:
+                with self.__taken_lock:
+                    self.__taken[email] = True
+            return taken
         except mariadb.Error as e:
-            print(f"Error on checking if email exist: {e}")
+            logger.exception("Error on checking if email exist: %s", e)
             return False
         finally:
             cursor.close()
+
+    def check_conflicts(self, username: str, email: str) -> (bool, bool):
+        cursor = self.db.conn.cursor()
+        try:
+            cursor.execute("""
+                        SELECT EXISTS (SELECT 1 FROM User WHERE Username = ?),
+                               EXISTS (SELECT 1 FROM User WHERE Email = ?)
+                    """, (username, email))
+            row = cursor.fetchone()
+            return bool(row[0]), bool(row[1])
+        except mariadb.Error as e:
+            logger.exception("Error on checking if username or email exist: %s", e)
+            return False, False
+        finally:
+            cursor.close()
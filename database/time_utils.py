@@ -0,0 +1,27 @@
+"""
+Time helpers shared by the data classes and the blueprints.
+
+Every timestamp written by the API (order entry/exit times, refresh token expiry) and every
+statistics window is computed in UTC, so stored values do not depend on the host time zone.
+The DATETIME columns carry no zone information, so the values are kept naive.
+
+It lives in the database package, which `utils` already depends on, so the data classes can use it without
+an import cycle; `utils` re-exports it for the blueprints.
+
+Functions:
+- utc_now(): Returns the current UTC time as a naive datetime.
+
+Example usage:
+    expires_at = utc_now() + timedelta(days=7)
+"""
+from datetime import datetime, timezone
+
+
+def utc_now() -> datetime:
+    """
+        Returns the current UTC time without tzinfo, ready to be stored in a DATETIME column.
+
+        Returns:
+            datetime: The current UTC time as a naive datetime.
+    """
+    return datetime.now(timezone.utc).replace(tzinfo=None)
@@ -5,6 +5,7 @@ from flask_jwt_extended import JWTManager
 
 from Routes import *
 from database import *
+from utils import cache, load_json_body, OrjsonProvider
 from utils.security_utils import generate_bcrypt_hash
 
 
@@ -30,7 +31,7 @@ def add_default_user_if_no_users():
             - Ensure `DEFAULT_USER` and `DEFAULT_PASSWORD` environment variables are set.
             - Using a default user may pose security risks in production environments.
     """
-    if db.user_repository.select_all():
+    if db.user_repository.exists_any():
         return
 
     default_user = User(
@@ -60,6 +61,23 @@ def get_app():
     new_app.config['JWT_REFRESH_TOKEN_EXPIRES'] = timedelta(days=int(os.getenv("JWT_REFRESH_TOKEN_EXPIRES_DAYS")))
     jwt = JWTManager(new_app)
 
+    # jsonify and request.get_json serialize/parse with orjson
+    new_app.json = OrjsonProvider(new_app)
+
+    # Parse the JSON body once, validators and handlers read it from g.body
+    new_app.before_request(load_json_body)
+
+    # Return the pooled database connection once the request is over
+    @new_app.teardown_appcontext
+    def release_db_connection(exception=None):
+        db.release()
+
+    # Cache for read-mostly endpoints, in-process by default or shared through Redis
+    cache.init_app(new_app, config={
+        "CACHE_TYPE": os.getenv("CACHE_TYPE", "SimpleCache"),
+        "CACHE_REDIS_URL": os.getenv("CACHE_REDIS_URL"),
+    })
+
     # Register blueprints for different API endpoints
     new_app.register_blueprint(product_blueprint, url_prefix="/product")
     new_app.register_blueprint(kg_price_blueprint, url_prefix="/kg_price")
@@ -80,8 +98,8 @@ def main():
 
     This script initializes and runs a Flask app with debugging enabled, as well as checks for and adds default users if there are none in the database.
     """
-    app.run(debug=True)
     add_default_user_if_no_users()
+    app.run(debug=True)
 
 
 if __name__ == '__main__':
@@ -6,7 +6,18 @@ Modules:
 - role_required: Decorator for enforcing role-based access control in Flask applications.
 - generate_bcrypt_hash: Function to generate bcrypt hashes for secure password storage.
 - verify_bcrypt_password: Function to verify plain passwords against their bcrypt hashes.
+- json_response: Function to build JSON responses serialized with orjson.
+- static_error: Function precomputing a constant JSON error body, returning a factory for its responses.
+- stream_page: Function to stream a page of rows as JSON while they are read from the database.
+- OrjsonProvider: Flask JSON provider serializing `jsonify` responses and parsing request bodies with orjson.
+- load_json_body: before_request hook that parses the request body once into `flask.g.body`.
+- utc_now: Function returning the current UTC time as a naive datetime.
+- cache: Flask-Caching instance shared by the blueprints to memoize read-mostly queries.
+- STOCK_SUMMARY_KEY: Cache key of the product stock summary, cleared whenever the stock changes.
 """
 
 from utils.http_status import HttpStatus
 from utils.security_utils import role_required, generate_bcrypt_hash, verify_bcrypt_password
+from utils.cache import cache, STOCK_SUMMARY_KEY
+from utils.json_utils import json_response, load_json_body, stream_page, static_error, OrjsonProvider
+from database.time_utils import utc_now
@@ -0,0 +1,24 @@
+"""
+Shared Flask-Caching instance used to memoize read-mostly endpoints.
+
+The instance is created unbound so blueprints can import it at module load; the application
+factory binds it with `cache.init_app(app, config=...)`. The backend is chosen by the `CACHE_TYPE`
+environment variable: `SimpleCache` keeps entries inside each worker, `RedisCache` (with
+`CACHE_REDIS_URL`) shares them, and their invalidations, between every worker.
+
+Keys used with explicit `cache.get`/`cache.set` calls are defined here so that readers and writers
+in different blueprints agree on them.
+
+Example usage:
+    @cache.memoize(timeout=60)
+    def expensive_query(offset):
+        ...
+
+    cache.delete_memoized(expensive_query)
+"""
+from flask_caching import Cache
+
+cache = Cache()
+
+# Product stock summary served by /statistics/product/stock
+STOCK_SUMMARY_KEY = "stats:stock"
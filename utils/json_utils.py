@@ -0,0 +1,158 @@
+"""
+Fast JSON responses backed by orjson.
+
+`json_response` serializes a payload in a single pass with orjson (dataclasses, enums and lists of
+either are handled natively in C) and wraps it in a Flask `Response`. The values are rendered as
+`jsonify` renders them: `datetime` values as HTTP dates and `Decimal` values as strings. Dict keys are
+sorted, but orjson serializes dataclass fields in declaration order, while `jsonify` sorts them as well;
+clients must not rely on the key order of the rows.
+
+`OrjsonProvider` plugs the same serialization into Flask itself (`app.json`), so `jsonify` and
+`request.get_json` go through orjson as well.
+
+`load_json_body` is registered as a `before_request` hook and parses the request body once into
+`flask.g.body`, which the validators and the handlers then read as a plain dict.
+
+Functions:
+- json_response(status=200, **payload): Build an `application/json` response from keyword arguments.
+- stream_page(rows, key, limit, cursor_of=None): Stream a page of rows as a JSON object while they are read.
+- static_error(message, status): Serialize a constant error once and return a factory for its responses.
+- load_json_body(): Parse the JSON body of the current request into `g.body` (empty dict when absent).
+
+Classes:
+- OrjsonProvider: Flask JSON provider delegating `dumps`/`loads` and `jsonify` responses to orjson.
+
+Example usage:
+    return json_response(kg_prices=kg_prices, has_next=False)
+"""
+import decimal
+from datetime import date
+from itertools import chain
+
+import orjson
+from flask import Response, g, request, stream_with_context
+from flask.json.provider import JSONProvider
+from werkzeug.http import http_date
+
+_OPTIONS = orjson.OPT_SORT_KEYS | orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+
+# Marks an empty page in stream_page, rows themselves may be any object
+_NO_ROW = object()
+
+
+# Fallback for the types orjson leaves to the caller, mirroring Flask's default JSON provider
+def _default(o):
+    if isinstance(o, date):
+        return http_date(o)
+    if isinstance(o, decimal.Decimal):
+        return str(o)
+    raise TypeError(f"Object of type {type(o).__name__} is not JSON serializable")
+
+
+class OrjsonProvider(JSONProvider):
+    """
+        Flask JSON provider backed by orjson, installed with `app.json = OrjsonProvider(app)`.
+
+        It renders values like Flask's default provider (HTTP dates, `Decimal` as string) and sorts dict keys,
+        but dataclass rows keep their field order instead of being sorted.
+    """
+    def dumps(self, obj, **kwargs) -> str:
+        return orjson.dumps(obj, default=_default, option=_OPTIONS).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    # Same as JSONProvider.response, without the bytes -> str -> bytes round trip of dumps
+    def response(self, *args, **kwargs) -> Response:
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(orjson.dumps(obj, default=_default, option=_OPTIONS),
+                                        mimetype="application/json")
+
+
+def json_response(status: int = 200, **payload) -> Response:
+    """
+        Serializes the keyword arguments with orjson and returns them as a JSON response.
+
+        Args:
+            status (int): HTTP status code of the response. Defaults to 200.
+            **payload: Fields of the JSON object to return.
+
+        Returns:
+            Response: A Flask response with the `application/json` mimetype.
+    """
+    return Response(orjson.dumps(payload, default=_default, option=_OPTIONS), status=status, mimetype="application/json")
+
+
+def static_error(message: str, status: int):
+    """
+        Serializes a constant `{"error": message}` body once, at import time, for hot failure paths.
+
+        A `Response` is mutable and may be altered by Flask after the handler returns, so it is not shared
+        between requests; only the encoded body is, and each call wraps it in a fresh response.
+
+        Args:
+            message (str): The error message.
+            status (int): HTTP status code of the response.
+
+        Returns:
+            callable: A function taking no arguments that returns the error `Response`.
+    """
+    body = orjson.dumps({"error": message}, option=_OPTIONS)
+
+    def make_response() -> Response:
+        return Response(body, status=status, mimetype="application/json")
+
+    return make_response
+
+
+def stream_page(rows, key: str, limit: int, cursor_of=None) -> Response:
+    """
+        Streams a page of rows as `{key: [...], "has_next": ..., "next_cursor": ...}`, serializing each
+        row as it comes off the database cursor instead of building the whole list first.
+
+        Args:
+            rows (Iterable): The rows of the page, fetched with `limit + 1` to detect a next page.
+            key (str): Name of the JSON field holding the rows.
+            limit (int): Number of rows in a page; an extra row only sets `has_next`.
+            cursor_of (callable, optional): Returns the `next_cursor` value from the last row sent.
+
+        Returns:
+            Response: A streamed Flask response with the `application/json` mimetype.
+
+        Raises:
+            Exception: Whatever reading the first row raises, before the response starts. An error after that
+                aborts the stream, so the client gets an incomplete body rather than a page that looks complete.
+    """
+    # the query runs here, while an error can still become an error response instead of a 200
+    rows = iter(rows)
+    first = next(rows, _NO_ROW)
+
+    def generate():
+        yield b'{"' + key.encode() + b'":['
+        count = 0
+        last = None
+        has_next = False
+        for row in (() if first is _NO_ROW else chain((first,), rows)):
+            if count == limit:
+                has_next = True
+                continue
+            yield (b',' if count else b'') + orjson.dumps(row, default=_default, option=_OPTIONS)
+            last = row
+            count += 1
+
+        tail = {"has_next": has_next}
+        if has_next and cursor_of is not None:
+            tail["next_cursor"] = cursor_of(last)
+        yield b'],' + orjson.dumps(tail, default=_default, option=_OPTIONS)[1:]
+
+    return Response(stream_with_context(generate()), mimetype="application/json")
+
+
+def load_json_body():
+    """
+        Parses the JSON body of the current request once and stores it in `g.body`.
+
+        Requests without a JSON body (plain GETs, wrong content type or malformed JSON) get an empty
+        dict, so the validators report the missing fields instead of failing on `None`.
+    """
+    g.body = request.get_json(silent=True) or {}
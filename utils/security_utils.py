@@ -2,7 +2,7 @@
 This module provides utility functions and decorators for user authentication and role-based access control in a Flask application.
 
 Functions:
-- role_required(db: DB, required_roles: list[UserRole]): A decorator that checks if the current user has one of the required roles. If not, it returns a 403 error. Requires JWT authentication.
+- role_required(db: DB, required_roles: Iterable[UserRole]): A decorator that checks if the current user has one of the required roles. If not, it returns a 403 error. Requires JWT authentication. The resolved user is stored in `flask.g.current_user` for the rest of the request.
 - generate_bcrypt_hash(data): Generates a bcrypt hash of the provided data (string).
 - verify_bcrypt_password(plain_password, hashed_password): Verifies if the provided plain password matches the hashed password using bcrypt.
 
@@ -11,28 +11,47 @@ Dependencies:
 - Flask-JWT-Extended: For handling JSON Web Tokens for user authentication.
 - Bcrypt: For securely hashing passwords.
 - Database: Custom database interactions for user role management.
-"""
 
+Notes:
+- The bcrypt cost factor is read once from the `BCRYPT_ROUNDS` environment variable (default 12).
+- Importing this module fails fast if bcrypt is not backed by its compiled Rust extension, since the
+  hashing cost dominates the login, register and edit endpoints.
+"""
+import hmac
+import os
 from functools import wraps
+from typing import Iterable
 
 import bcrypt
-from flask import jsonify
+from flask import jsonify, g
 from flask_jwt_extended import jwt_required, get_jwt_identity
 
 from database import UserRole, DB
 
+if not hasattr(bcrypt, "_bcrypt"):
+    raise ImportError("bcrypt native backend not available, install bcrypt>=4 with its compiled extension.")
+
+_BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+_hashpw = bcrypt.hashpw
+_gensalt = bcrypt.gensalt
+_compare_digest = hmac.compare_digest
 
-def role_required(db: DB, required_roles: list[UserRole]):
+
+def role_required(db: DB, required_roles: Iterable[UserRole]):
     """
     Decorator to restrict access to a view based on user roles.
 
     Args:
         db (DB): The database instance for user role retrieval.
-        required_roles (list[UserRole]): A list of roles allowed to access the decorated function.
+        required_roles (Iterable[UserRole]): The roles allowed to access the decorated function. They are
+            frozen into a set once, when the decorator is applied.
 
     Returns:
-        function: The wrapped function that checks user roles.
+        function: The wrapped function that checks user roles. On success, the caller's `User` is
+        available as `flask.g.current_user`.
     """
+    # built once per route, the per-request membership test is a hash lookup
+    allowed_roles = frozenset(required_roles)
 
     def decorator(fn):
         @wraps(fn)
@@ -44,9 +63,12 @@ def role_required(db: DB, required_roles: list[UserRole]):
             if current_user is None:
                 return jsonify({"msg": "User not found"}), 404
 
-            if not (current_user.role in required_roles):
+            if current_user.role not in allowed_roles:
                 return jsonify({"msg": "Access denied"}), 403
 
+            # reused by the handlers instead of loading the caller again
+            g.current_user = current_user
+
             return fn(*args, **kwargs)
 
         return wrapper
@@ -64,13 +86,16 @@ def generate_bcrypt_hash(data):
     Returns:
         str: The bcrypt hashed representation of the data.
     """
-    return bcrypt.hashpw(data.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+    return _hashpw(data.encode('utf-8'), _gensalt(rounds=_BCRYPT_ROUNDS)).decode('utf-8')
 
 
 def verify_bcrypt_password(plain_password, hashed_password):
     """
     Verifies if the plain password matches the hashed password.
 
+    The stored hash is re-derived with its own salt and compared with `hmac.compare_digest`,
+    so the comparison time does not depend on where the hashes differ.
+
     Args:
         plain_password (str): The plain password to verify.
         hashed_password (str): The hashed password to compare against.
@@ -78,4 +103,5 @@ def verify_bcrypt_password(plain_password, hashed_password):
     Returns:
         bool: True if the passwords match, False otherwise.
     """
-    return bcrypt.checkpw(plain_password.encode('utf-8'), hashed_password.encode('utf-8'))
+    hashed_password = hashed_password.encode('utf-8')
+    return _compare_digest(_hashpw(plain_password.encode('utf-8'), hashed_password), hashed_password)
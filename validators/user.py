@@ -17,115 +17,98 @@ Optional Decorators:
 - `optional_user_role`: Validates 'user_role' if provided, ensuring it meets the same criteria as `require_user_role`.
 - `optional_new_username`: Validates 'new_username' if provided, ensuring it meets the same criteria as `require_username`.
 
-Each decorator returns a JSON response with an error message and a status code of 401 if the validation fails. If validation passes, the decorated function is called with the original arguments.
+Each decorator returns a JSON response with an error message and a status code of 401 if the validation fails. If validation passes, the decorated function is called with the original arguments. The underlying checks are exposed through `.rule`, so several of them can be combined with `validators.utils.validate`.
 """
 import re
-from flask import jsonify, request
+from flask import jsonify
 from database import UserRole
+from validators.utils import rule
 
 
 # region require
 
 # Ensures 'name' is a valid string between 1 and 255 characters, matching allowed characters
-def require_name(func):
-    def wrapper(*args, **kwargs):
-        name = request.json.get('name')
+@rule
+def require_name(payload):
+    name = payload.get('name')
 
-        if not isinstance(name, str):
-            return jsonify(error=f"Invalid name type, expected string got {type(name)}."), 401
+    if not isinstance(name, str):
+        return jsonify(error=f"Invalid name type, expected string got {type(name)}."), 401
 
-        if not re.fullmatch(r"^[\w\s]{1,255}$", name):
-            return jsonify(error="Invalid name format."), 401
+    if not re.fullmatch(r"^[\w\s]{1,255}$", name):
+        return jsonify(error="Invalid name format."), 401
 
-        return func(*args, **kwargs)
-
-    wrapper.__name__ = func.__name__
-    return wrapper
+    return None
 
 
 # Ensures 'email' is a valid string format and does not exceed 255 characters
-def require_email(func):
-    def wrapper(*args, **kwargs):
-        email = request.json.get('email')
-
-        if not isinstance(email, str):
-            return jsonify(error=f"Invalid email type, expected string got {type(email)}."), 401
+@rule
+def require_email(payload):
+    email = payload.get('email')
 
-        if not re.fullmatch(r"^[\w\-.]+@([\w-]+\.)+[\w-]{2,4}$", email) or len(email) > 255:
-            return jsonify(error="Invalid email format."), 401
+    if not isinstance(email, str):
+        return jsonify(error=f"Invalid email type, expected string got {type(email)}."), 401
 
-        return func(*args, **kwargs)
+    if not re.fullmatch(r"^[\w\-.]+@([\w-]+\.)+[\w-]{2,4}$", email) or len(email) > 255:
+        return jsonify(error="Invalid email format."), 401
 
-    wrapper.__name__ = func.__name__
-    return wrapper
+    return None
 
 
 # Ensures 'username' is a valid string between 1 and 255 characters, matching allowed characters
-def require_username(func):
-    def wrapper(*args, **kwargs):
-        username = request.json.get('username')
-
-        if not isinstance(username, str):
-            return jsonify(error=f"Invalid username type, expected string got {type(username)}."), 401
+@rule
+def require_username(payload):
+    username = payload.get('username')
 
-        if not re.fullmatch(r"^[\w\s-]{1,255}$", username):
-            return jsonify(error="Invalid username format."), 401
+    if not isinstance(username, str):
+        return jsonify(error=f"Invalid username type, expected string got {type(username)}."), 401
 
-        return func(*args, **kwargs)
+    if not re.fullmatch(r"^[\w\s-]{1,255}$", username):
+        return jsonify(error="Invalid username format."), 401
 
-    wrapper.__name__ = func.__name__
-    return wrapper
+    return None
 
 
 # Ensures 'password' is a valid string with at least 8 characters
-def require_password(func):
-    def wrapper(*args, **kwargs):
-        password_raw = request.json.get('password')
+@rule
+def require_password(payload):
+    password_raw = payload.get('password')
 
-        if not isinstance(password_raw, str):
-            return jsonify(error=f"Invalid password type, expected string got {type(password_raw)}."), 401
+    if not isinstance(password_raw, str):
+        return jsonify(error=f"Invalid password type, expected string got {type(password_raw)}."), 401
 
-        if len(password_raw) < 8:
-            return jsonify(error="Password must be at least 8 characters long."), 401
+    if len(password_raw) < 8:
+        return jsonify(error="Password must be at least 8 characters long."), 401
 
-        return func(*args, **kwargs)
-
-    wrapper.__name__ = func.__name__
-    return wrapper
+    return None
 
 
 # Ensures 'active' is a valid boolean value
-def require_active(func):
-    def wrapper(*args, **kwargs):
-        active = request.json.get('active')
-
-        if not isinstance(active, bool):
-            return jsonify(error=f"Invalid active type, expected bool got {type(active)}."), 401
+@rule
+def require_active(payload):
+    active = payload.get('active')
 
-        if active not in [True, False]:
-            return jsonify(error="Active must be a boolean."), 401
+    if not isinstance(active, bool):
+        return jsonify(error=f"Invalid active type, expected bool got {type(active)}."), 401
 
-        return func(*args, **kwargs)
+    if active not in [True, False]:
+        return jsonify(error="Active must be a boolean."), 401
 
-    wrapper.__name__ = func.__name__
-    return wrapper
+    return None
 
 
 # Ensures 'user_role' is a valid string and matches defined user roles
-def require_user_role(func):
-    def wrapper(*args, **kwargs):
-        user_role = request.json.get('user_role')
-
-        if not isinstance(user_role, str):
-            return jsonify(error=f"Invalid user role type, expected string got {type(user_role)}."), 401
+@rule
+def require_user_role(payload):
+    user_role = payload.get('user_role')
 
-        if user_role not in [r.value for r in UserRole]:
-            return jsonify(error="Invalid user role."), 401
+    if not isinstance(user_role, str):
+        return jsonify(error=f"Invalid user role type, expected string got {type(user_role)}."), 401
 
-        return func(*args, **kwargs)
+    if user_role not in [r.value for r in UserRole]:
+        return jsonify(error="Invalid user role."), 401
 
-    wrapper.__name__ = func.__name__
-    return wrapper
+    return None
 
 
 # endregion
@@ -134,121 +117,103 @@ def require_user_role(func):
 
 
 # Ensures 'name', if provided, is a valid string between 1 and 255 characters, matching allowed characters
-def optional_name(func):
-    def wrapper(*args, **kwargs):
-        name = request.json.get('name', None)
-        if name is None:
-            return func(*args, **kwargs)
+@rule
+def optional_name(payload):
+    name = payload.get('name', None)
+    if name is None:
+        return None
 
-        if not isinstance(name, str):
-            return jsonify(error=f"Invalid name type, expected string got {type(name)}."), 401
+    if not isinstance(name, str):
+        return jsonify(error=f"Invalid name type, expected string got {type(name)}."), 401
 
-        if not re.fullmatch(r"^[\w\s]{1,255}$", name):
-            return jsonify(error="Invalid name format."), 401
+    if not re.fullmatch(r"^[\w\s]{1,255}$", name):
+        return jsonify(error="Invalid name format."), 401
 
-        return func(*args, **kwargs)
-
-    wrapper.__name__ = func.__name__
-    return wrapper
+    return None
 
 
 # Ensures 'email', if provided, is a valid string format and does not exceed 255 characters
-def optional_email(func):
-    def wrapper(*args, **kwargs):
-        email = request.json.get('email', None)
-
-        if email is None:
-            return func(*args, **kwargs)
+@rule
+def optional_email(payload):
+    email = payload.get('email', None)
 
-        if not isinstance(email, str):
-            return jsonify(error=f"Invalid email type, expected string got {type(email)}."), 401
+    if email is None:
+        return None
 
-        if not re.fullmatch(r"^[\w\-.]+@([\w-]+\.)+[\w-]{2,4}$", email) or len(email) > 255:
-            return jsonify(error="Invalid email format."), 401
+    if not isinstance(email, str):
+        return jsonify(error=f"Invalid email type, expected string got {type(email)}."), 401
 
-        return func(*args, **kwargs)
+    if not re.fullmatch(r"^[\w\-.]+@([\w-]+\.)+[\w-]{2,4}$", email) or len(email) > 255:
+        return jsonify(error="Invalid email format."), 401
 
-    wrapper.__name__ = func.__name__
-    return wrapper
+    return None
 
 
 # Ensures 'password', if provided, is a valid string with at least 8 characters
-def optional_password(func):
-    def wrapper(*args, **kwargs):
-        password_raw = request.json.get('password', None)
-
-        if password_raw is None:
-            return func(*args, **kwargs)
+@rule
+def optional_password(payload):
+    password_raw = payload.get('password', None)
 
-        if not isinstance(password_raw, str):
-            return jsonify(error=f"Invalid password type, expected string got {type(password_raw)}."), 401
+    if password_raw is None:
+        return None
 
-        if len(password_raw) < 8:
-            return jsonify(error="Password must be at least 8 characters long."), 401
+    if not isinstance(password_raw, str):
+        return jsonify(error=f"Invalid password type, expected string got {type(password_raw)}."), 401
 
-        return func(*args, **kwargs)
+    if len(password_raw) < 8:
+        return jsonify(error="Password must be at least 8 characters long."), 401
 
-    wrapper.__name__ = func.__name__
-    return wrapper
+    return None
 
 
 # Ensures 'active', if provided, is a valid boolean value
-def optional_active(func):
-    def wrapper(*args, **kwargs):
-        active = request.json.get('active', None)
+@rule
+def optional_active(payload):
+    active = payload.get('active', None)
 
-        if active is None:
-            return func(*args, **kwargs)
+    if active is None:
+        return None
 
-        if not isinstance(active, bool):
-            return jsonify(error=f"Invalid active type, expected bool got {type(active)}."), 401
+    if not isinstance(active, bool):
+        return jsonify(error=f"Invalid active type, expected bool got {type(active)}."), 401
 
-        if active not in [True, False]:
-            return jsonify(error="Active must be a boolean."), 401
+    if active not in [True, False]:
+        return jsonify(error="Active must be a boolean."), 401
 
-        return func(*args, **kwargs)
-
-    wrapper.__name__ = func.__name__
-    return wrapper
+    return None
 
 
 # Ensures 'user_role', if provided, is a valid string and matches defined user roles
-def optional_user_role(func):
-    def wrapper(*args, **kwargs):
-        user_role = request.json.get('user_role', None)
-
-        if user_role is None:
-            return func(*args, **kwargs)
+@rule
+def optional_user_role(payload):
+    user_role = payload.get('user_role', None)
 
-        if not isinstance(user_role, str):
-            return jsonify(error=f"Invalid user role type, expected string got {type(user_role)}."), 401
+    if user_role is None:
+        return None
 
-        if user_role not in [r.value for r in UserRole]:
-            return jsonify(error="Invalid user role."), 401
+    if not isinstance(user_role, str):
+        return jsonify(error=f"Invalid user role type, expected string got {type(user_role)}."), 401
 
-        return func(*args, **kwargs)
+    if user_role not in [r.value for r in UserRole]:
+        return jsonify(error="Invalid user role."), 401
 
-    wrapper.__name__ = func.__name__
-    return wrapper
+    return None
 
 
 # Ensures 'new_username', if provided, is a valid string between 1 and 255 characters, matching allowed characters
-def optional_new_username(func):
-    def wrapper(*args, **kwargs):
-        username = request.json.get('new_username', None)
-
-        if username is None:
-            return func(*args, **kwargs)
+@rule
+def optional_new_username(payload):
+    username = payload.get('new_username', None)
 
-        if not isinstance(username, str):
-            return jsonify(error=f"Invalid new_username type, expected string got {type(username)}."), 401
+    if username is None:
+        return None
 
-        if not re.fullmatch(r"^[\w\s-]{1,255}$", username):
-            return jsonify(error="Invalid new_username format."), 401
+    if not isinstance(username, str):
+        return jsonify(error=f"Invalid new_username type, expected string got {type(username)}."), 401
 
-        return func(*args, **kwargs)
+    if not re.fullmatch(r"^[\w\s-]{1,255}$", username):
+        return jsonify(error="Invalid new_username format."), 401
 
-    wrapper.__name__ = func.__name__
-    return wrapper
+    return None
 
 # endregion
@@ -1,44 +1,132 @@
 """
-This module provides a Flask decorator for validating the 'offset' parameter
-in incoming JSON requests.
+This module provides the building blocks shared by every validator, plus Flask
+decorators for validating the 'offset' and 'cursor' pagination parameters in
+incoming JSON requests.
+
+Every validator is a rule: a function that receives the JSON body and returns
+an error response, or None when the body is valid. The `rule` decorator turns
+such a function into a classic route decorator, and `validate` runs several
+rules inside a single wrapper so a route pays one call frame and one JSON
+parse instead of one per field.
 
 The `optional_offset` decorator ensures that if the 'offset' parameter is
 present in the request, it is a valid non-negative integer. If 'offset' is
 not provided, it defaults to 0. If the validation fails, an error response
 is returned with a 401 status code.
 
+The `optional_cursor` decorator ensures that if the 'cursor' parameter is
+present and not null, it is a positive integer (the ID of the last row seen).
+
 Functions:
+- rule(check): Turns a check into a route decorator that also exposes the check as `.rule`.
+- validate(*validators): Decorator that runs the given validators in order within one wrapper.
 - optional_offset(func): Decorator that validates the 'offset' parameter.
+- optional_cursor(func): Decorator that validates the 'cursor' parameter.
 """
-from flask import request, jsonify
+from flask import g, jsonify
+
+
+def rule(check):
+    """
+        Turns a check into a route decorator, keeping the check reachable through `.rule`.
+
+        Args:
+            check (callable): Function receiving the JSON body and returning an error response or None.
+
+        Returns:
+            callable: A decorator that runs the check before executing the decorated function.
+    """
+    def decorator(func):
+        def wrapper(*args, **kwargs):
+            error = check(g.body)
+            if error is not None:
+                return error
+            return func(*args, **kwargs)
+
+        wrapper.__name__ = func.__name__
+        return wrapper
+
+    decorator.rule = check
+    decorator.__name__ = check.__name__
+    decorator.__doc__ = check.__doc__
+    return decorator
+
+
+def validate(*validators):
+    """
+        Decorator that runs several validators, in the given order, inside a single wrapper.
+
+        Args:
+            *validators (callable): Validators created with `rule`.
+
+        Returns:
+            callable: A decorator that returns the first validation error or executes the decorated function.
+    """
+    checks = tuple(v.rule for v in validators)
+
+    def decorator(func):
+        def wrapper(*args, **kwargs):
+            payload = g.body
+            for check in checks:
+                error = check(payload)
+                if error is not None:
+                    return error
+            return func(*args, **kwargs)
+
+        wrapper.__name__ = func.__name__
+        return wrapper
+
+    return decorator
 
 
 # region optional
 
 
 # Ensures 'offset', if provided, is a valid non-negative integer (default is 0)
-def optional_offset(func):
+@rule
+def optional_offset(payload):
     """
-        Decorator that checks if 'offset', if provided, is a valid non-negative integer (default is 0).
+        Validator that checks if 'offset', if provided, is a valid non-negative integer (default is 0).
 
         Args:
-            func (callable): The function to be wrapped.
+            payload (dict): The JSON body of the request.
 
         Returns:
-            callable: A wrapper function that includes offset validation before executing the original function.
+            tuple | None: An error response when validation fails, otherwise None.
         """
-    def wrapper(*args, **kwargs):
-        offset = request.json.get('offset', 0)
+    offset = payload.get('offset', 0)
+
+    if not isinstance(offset, int):
+        return jsonify(error=f"Invalid offset type, expected int got {type(offset)}."), 401
+
+    if offset < 0:
+        return jsonify(error="offset must be greater or equal to zero."), 401
 
-        if not isinstance(offset, int):
-            return jsonify(error=f"Invalid offset type, expected int got {type(offset)}."), 401
+    return None
+
+
+# Ensures 'cursor', if provided, is a valid positive integer (default is None, the first page)
+@rule
+def optional_cursor(payload):
+    """
+        Validator that checks if 'cursor', if provided, is a valid positive integer (default is None).
+
+        Args:
+            payload (dict): The JSON body of the request.
+
+        Returns:
+            tuple | None: An error response when validation fails, otherwise None.
+        """
+    cursor = payload.get('cursor')
+    if cursor is None:
+        return None
 
-        if offset < 0:
-            return jsonify(error="offset must be greater or equal to zero."), 401
+    if not isinstance(cursor, int):
+        return jsonify(error=f"Invalid cursor type, expected int got {type(cursor)}."), 401
 
-        return func(*args, **kwargs)
+    if cursor <= 0:
+        return jsonify(error="cursor must be greater than zero."), 401
 
-    wrapper.__name__ = func.__name__
-    return wrapper
+    return None
 
 # endregion